@@ -1,12 +1,38 @@
 import argparse
+import asyncio
+import atexit
+import collections
+import contextlib
 import hashlib
+import itertools
+import json
+import mmap
 import os
+import queue
+import random
 import re
-from typing import Optional, Tuple
-
+import shutil
+import socket
+import sqlite3
+import struct
+import subprocess
+import sys
+import tarfile
+import threading
+import time
+import unicodedata
+import urllib.request
+import uuid
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable, Iterator, Optional, Tuple
+
+import httpx
 from dotenv import load_dotenv
-from notion_client import Client
-from notion_client.errors import APIResponseError
+from notion_client import AsyncClient, Client
+from notion_client.errors import APIResponseError, HTTPResponseError, RequestTimeoutError
 
 # Optional converters
 try:
@@ -23,6 +49,14 @@ try:
 except Exception:
     HAS_STRIPRTF = False
 
+# Optional faster HTML parser for BeautifulSoup
+try:
+    import lxml  # type: ignore  # noqa: F401
+
+    HAS_LXML = True
+except Exception:
+    HAS_LXML = False
+
 import datetime as dt
 import plistlib
 from dataclasses import dataclass
@@ -46,12 +80,6 @@ database_id = os.environ.get("NOTION_DB_ID")
 
 default_tz = os.environ.get("TZ", "America/New_York")
 
-if not token:
-    raise SystemExit("ERROR: NOTION_TOKEN is not set (see .env.example).")
-
-if not database_id:
-    raise SystemExit("ERROR: NOTION_DB_ID is not set (see .env.example).")
-
 VERSION = "0.1.0"
 parser = argparse.ArgumentParser(
     prog="stickies_to_notion.py",
@@ -117,6 +145,29 @@ parser.add_argument(
     default="~/Library/Containers/com.apple.Stickies/Data/Library/Stickies",
     help="Folder containing Stickies .rtf/.rtfd files (RTF dir mode).",
 )
+parser.add_argument(
+    "--archive",
+    default=None,
+    help="Zip or tar (.tar.gz etc.) backup of a Stickies folder to import directly instead of "
+    "--mode; notes are read straight out of the archive, nothing is extracted to disk.",
+)
+parser.add_argument(
+    "--from-jsonl",
+    default=None,
+    help="Read notes from a JSON Lines file written by --extract-jsonl ('-' for stdin) instead "
+    "of --mode.",
+)
+parser.add_argument(
+    "--extract-jsonl",
+    default=None,
+    help="Write the notes to this JSON Lines file ('-' for stdout) instead of uploading them (no "
+    "Notion writes); upload it later, e.g. on another machine, with --from-jsonl.",
+)
+parser.add_argument(
+    "--extract-blocks",
+    action="store_true",
+    help="With --extract-jsonl, convert the notes and write Notion blocks instead of raw RTF.",
+)
 parser.add_argument(
     "--show-db-path",
     action="store_true",
@@ -125,11 +176,131 @@ parser.add_argument(
 parser.add_argument(
     "--limit", type=int, default=None, help="Import at most N notes (useful for testing)."
 )
+parser.add_argument(
+    "--io-threads",
+    type=int,
+    default=4,
+    help="Threads that stat and read RTF files ahead of conversion (RTF dir mode; 0 = off).",
+)
+parser.add_argument(
+    "--read-ahead",
+    type=int,
+    default=32,
+    help="How many RTF files the I/O threads may read ahead of conversion (default 32).",
+)
+parser.add_argument(
+    "--window",
+    type=int,
+    default=200,
+    help="Read, convert and upload notes in windows of N to bound memory (default 200).",
+)
+parser.add_argument(
+    "--full-rescan",
+    action="store_true",
+    help="Read every RTF file even if the source manifest says it is unchanged since the last import.",
+)
 parser.add_argument(
     "--dry-run",
     action="store_true",
     help="Parse and show preview without writing anything to Notion.",
 )
+parser.add_argument(
+    "--converter",
+    choices=["pandoc", "pandoc-json", "native"],
+    default="pandoc",
+    help="RTF converter: 'pandoc' (RTF → HTML → blocks), 'pandoc-json' (pandoc's JSON AST → blocks, "
+    "no HTML parsing) or 'native' (direct RTF → blocks for the Stickies RTF subset, falling back "
+    "to pandoc for anything else).",
+)
+parser.add_argument(
+    "--html-parser",
+    choices=["auto", "lxml", "html.parser"],
+    default="auto",
+    help="BeautifulSoup parser for pandoc's HTML; 'auto' uses lxml when installed (default).",
+)
+parser.add_argument(
+    "--triage",
+    action="store_true",
+    help="Pre-scan each note's RTF and convert unformatted notes with the built-in tokenizer "
+    "instead of the configured converter.",
+)
+parser.add_argument(
+    "--cache-dir",
+    default=None,
+    help="Directory for the conversion cache (default: ~/Library/Caches/stickies-importer).",
+)
+parser.add_argument(
+    "--cache-max-mb",
+    type=int,
+    default=512,
+    help="Evict least recently used cache entries beyond this size (default 512).",
+)
+parser.add_argument(
+    "--no-cache",
+    action="store_true",
+    help="Convert every note from scratch without reading or writing the conversion cache.",
+)
+parser.add_argument(
+    "--pandoc-workers",
+    type=int,
+    default=0,
+    help="Convert through N persistent `pandoc server` workers instead of one pandoc process per note, "
+    "N notes at a time (0 = off).",
+)
+parser.add_argument(
+    "--pandoc-batch",
+    type=int,
+    default=0,
+    help="Convert N notes per pandoc invocation, splitting the output on sentinel markers (0 = off).",
+)
+parser.add_argument(
+    "--jobs",
+    type=int,
+    default=1,
+    help="Convert notes in N worker processes (default 1; order of notes is preserved).",
+)
+parser.add_argument(
+    "--concurrency",
+    type=int,
+    default=1,
+    help="Keep up to N Notion page uploads in flight (asyncio; default 1 = one at a time).",
+)
+parser.add_argument(
+    "--adaptive",
+    action="store_true",
+    help="Adjust Notion requests in flight between --min-concurrency and --concurrency (AIMD, "
+    "driven by latency and 429/5xx responses; decisions are logged with --verbose).",
+)
+parser.add_argument(
+    "--min-concurrency",
+    type=int,
+    default=1,
+    help="Floor for --adaptive; it starts here and never goes lower (default 1).",
+)
+parser.add_argument(
+    "--rate",
+    type=float,
+    default=3.0,
+    help="Average Notion requests per second across all uploads (default 3, Notion's limit; 0 = unlimited).",
+)
+parser.add_argument(
+    "--burst",
+    type=int,
+    default=10,
+    help="Requests that may go out back to back before --rate applies (default 10).",
+)
+parser.add_argument(
+    "--retries",
+    type=int,
+    default=5,
+    help="Retry a Notion request up to N times on rate limits, 5xx errors and timeouts (default 5).",
+)
+parser.add_argument(
+    "--retry-backoff",
+    type=float,
+    default=1.0,
+    help="Base delay in seconds for exponential backoff between retries (default 1.0).",
+)
 parser.add_argument(
     "--version",
     action="version",
@@ -152,14 +323,21 @@ class StickyNote:
     color: Optional[str] = (
         None  # Color name like "Yellow", "Blue", "Green", "Pink", "Purple", "Gray"
     )
+    blocks: Optional[list] = None  # Pre-built Notion blocks (native converter), used over html
+
+
+# Zero-width, bidi and other format characters str.split() doesn't treat as whitespace
+_WS_TRANSLATE = {
+    cp: " " for cp in [*range(0x2000, 0x2010), *range(0x2028, 0x2030), *range(0x205F, 0x2070)]
+}
+_WS_TRANSLATE[0x00A0] = " "  # Non-breaking space
 
 
 def normalize_ws(s: str) -> str:
-    # Handle various Unicode whitespace and problem characters
-    s = s.replace("\u00A0", " ")  # Non-breaking space
-    s = re.sub(r"[\u2000-\u200F\u2028-\u202F\u205F-\u206F]", " ", s)  # Various Unicode spaces
-    s = re.sub(r"\s+", " ", s)  # Collapse multiple whitespace
-    return s.strip()
+    # Handle various Unicode whitespace and problem characters, then collapse runs of whitespace
+    if not s.isascii():
+        s = s.translate(_WS_TRANSLATE)
+    return " ".join(s.split())
 
 
 def first_nonempty_line(text: str) -> str:
@@ -178,77 +356,1592 @@ def truncate_title(s: str) -> str:
     return (s[: MAX_TITLE_LEN - 1] + "…") if len(s) > MAX_TITLE_LEN else s
 
 
+# Lone surrogates can't be encoded as UTF-8; deleting them via translate avoids a per-char loop
+_SURROGATES = dict.fromkeys(range(0xD800, 0xE000))
+
+
 def clean_unicode_text(text: str) -> str:
     """Clean text of problematic Unicode characters that can cause encoding issues."""
-    import unicodedata
+    if text.isascii():
+        return text  # already NFKC and surrogate-free
+    return unicodedata.normalize("NFKC", text.translate(_SURROGATES))
+
+
+# --- Persistent pandoc workers ---
+
+
+class PandocWorker:
+    """One long-lived `pandoc server` process listening on a local port."""
+
+    def __init__(self, pandoc_path: str, index: int):
+        self.pandoc_path = pandoc_path
+        self.index = index
+        self.proc: Optional[subprocess.Popen] = None
+        self.port: Optional[int] = None
+        self.conversions = 0
+        self.failures = 0
+        self.restarts = 0
+        self.busy_seconds = 0.0
+
+    def start(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        self.proc = subprocess.Popen(
+            [self.pandoc_path, "server", "--port", str(self.port), "--timeout", "120"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError(
+                    f"pandoc server exited with code {self.proc.returncode} "
+                    "(pandoc 3.x with server support is required)"
+                )
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=0.2):
+                    break
+            except OSError:
+                time.sleep(0.05)
+        else:
+            self.stop()
+            raise RuntimeError("pandoc server did not start listening within 10s")
+        # Some pandoc builds listen but drop every request (no threaded GHC runtime)
+        try:
+            self.convert("{\\rtf1 x}", "rtf", "html")
+        except Exception as e:
+            self.stop()
+            raise RuntimeError(f"pandoc server failed a test conversion ({e})") from None
+
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def stop(self):
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+        self.proc = None
+
+    def restart(self):
+        self.stop()
+        self.restarts += 1
+        self.start()
+
+    def convert(self, text: str, src: str, dst: str) -> str:
+        body = json.dumps({"text": text, "from": src, "to": dst}).encode("utf-8")
+        req = urllib.request.Request(
+            f"http://127.0.0.1:{self.port}/",
+            data=body,
+            headers={"Content-Type": "application/json", "Accept": "application/json"},
+        )
+        with urllib.request.urlopen(req, timeout=150) as resp:
+            payload = json.loads(resp.read().decode("utf-8"))
+        if isinstance(payload, dict):
+            return payload.get("output") or ""
+        return str(payload)
+
+
+class PandocPool:
+    """Hands conversions to idle workers and restarts any worker that has crashed."""
+
+    def __init__(self, size: int, pandoc_path: str):
+        self.workers = [PandocWorker(pandoc_path, i) for i in range(size)]
+        self._idle: "queue.Queue[PandocWorker]" = queue.Queue()
+        self._started = time.perf_counter()
+        try:
+            for w in self.workers:
+                w.start()
+                self._idle.put(w)
+        except Exception:
+            self.close()
+            raise
+        # One thread per server keeps every worker busy; see pandoc_map
+        self.executor = ThreadPoolExecutor(size, thread_name_prefix="pandoc")
+
+    def convert(self, text: str, src: str = "rtf", dst: str = "html") -> str:
+        w = self._idle.get()
+        try:
+            if not w.alive():
+                w.restart()
+            t0 = time.perf_counter()
+            try:
+                out = w.convert(text, src, dst)
+            except Exception:
+                w.failures += 1
+                if w.alive():
+                    raise
+                # The worker died mid-request: bring it back and retry once
+                w.restart()
+                out = w.convert(text, src, dst)
+            w.busy_seconds += time.perf_counter() - t0
+            w.conversions += 1
+            return out
+        finally:
+            self._idle.put(w)
+
+    def close(self):
+        if hasattr(self, "executor"):
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        for w in self.workers:
+            w.stop()
+
+    def report(self) -> list[str]:
+        wall = max(time.perf_counter() - self._started, 1e-9)
+        lines = []
+        for w in self.workers:
+            rate = w.conversions / w.busy_seconds if w.busy_seconds else 0.0
+            lines.append(
+                f"  worker {w.index}: {w.conversions} conversions, {rate:.1f}/s busy, "
+                f"{w.busy_seconds / wall:.0%} utilized, {w.failures} failures, {w.restarts} restarts"
+            )
+        return lines
+
+
+_pandoc_pool: Optional[PandocPool] = None
+
+
+def start_pandoc_pool(size: int) -> PandocPool:
+    """Start the shared worker pool used by rtf_to_html_and_text."""
+    global _pandoc_pool
+    pandoc_path = shutil.which("pandoc")
+    if HAS_PANDOC:
+        try:
+            pandoc_path = pypandoc.get_pandoc_path()
+        except Exception:
+            pass
+    if not pandoc_path:
+        raise SystemExit(
+            "ERROR: --pandoc-workers requires the pandoc binary (brew install pandoc)."
+        )
+    try:
+        _pandoc_pool = PandocPool(size, pandoc_path)
+    except RuntimeError as e:
+        raise SystemExit(f"ERROR: --pandoc-workers: {e}")
+    atexit.register(_pandoc_pool.close)
+    return _pandoc_pool
+
+
+def pandoc_map(fn, items: list) -> list:
+    """[fn(x) for x in items], with one call in flight per pandoc worker when the pool runs."""
+    if _pandoc_pool is None or len(items) < 2:
+        return [fn(x) for x in items]
+    return list(_pandoc_pool.executor.map(fn, items))
+
+
+def pandoc_convert(text: str, to: str = "html", src: str = "rtf") -> str:
+    """Convert with the persistent pool when running, otherwise a one-off pandoc process."""
+    if _pandoc_pool is not None:
+        return _pandoc_pool.convert(text, src, to)
+    return pypandoc.convert_text(text, to, format=src)
+
+
+def _decode_rtf(rtf_bytes: bytes) -> str:
+    # str(buffer, ...) decodes bytes, memoryviews and mmaps alike without an intermediate copy
+    try:
+        return str(rtf_bytes, "utf-8", errors="ignore")
+    except Exception:
+        return str(rtf_bytes, "latin-1", errors="ignore")
+
+
+def _html_result(html: str) -> Tuple[str, str, list]:
+    """Clean pandoc's HTML and derive (html, plain, blocks) from a single parse."""
+    html = clean_unicode_text(html)
+    plain, blocks = html_to_text_and_blocks(html)
+    plain = "\n".join([ln.rstrip() for ln in plain.splitlines()])
+    plain = clean_unicode_text(plain)
+    return html, plain, blocks
+
+
+def _rtf_fallback_text(s: str) -> str:
+    # Fallback: plain text via striprtf or crude regex strip
+    if HAS_STRIPRTF:
+        try:
+            text = rtf_to_text(s)
+        except Exception:
+            text = ""
+    else:
+        import re as _re
+
+        text = _re.sub(r"\\'[0-9a-fA-F]{2}", " ", s)
+        text = _re.sub(r"\\[a-zA-Z]+-?\d*\s?", "", text)
+        text = _re.sub(r"[{}]", "", text)
+    text = "\n".join([ln.rstrip() for ln in text.splitlines()])
+    return clean_unicode_text(text)
+
+
+def rtf_to_html_and_text(rtf_bytes: bytes) -> Tuple[Optional[str], str]:
+    """Return (html or None, plain_text). Prefer Pandoc HTML; fallback to plain."""
+    html, plain, _ = rtf_to_html_text_blocks(rtf_bytes)
+    return html, plain
+
+
+def rtf_to_html_text_blocks(rtf_bytes: bytes) -> Tuple[Optional[str], str, Optional[list]]:
+    """Like rtf_to_html_and_text, plus the Notion blocks built from the same parsed HTML."""
+    s = _decode_rtf(rtf_bytes)
+
+    html = None
+    if HAS_PANDOC or _pandoc_pool is not None:
+        try:
+            html = pandoc_convert(s, "html")
+        except Exception:
+            html = None
+
+    if html:
+        return _html_result(html)
+    return None, _rtf_fallback_text(s), None
+
+
+BATCH_MARKER = "STICKIESBATCH"
+batch_stats = {"batches": 0, "notes": 0, "fallbacks": 0}
+_batch_stats_lock = threading.Lock()  # batches run concurrently under --pandoc-workers
+
+
+def _split_batch_html(html: str, token: str, count: int) -> Optional[list[str]]:
+    """Split batched pandoc output on its sentinel paragraphs; None if any boundary was lost."""
+    marker = re.compile(
+        r"<p[^>]*>\s*(?:<[^>]+>\s*)*" + BATCH_MARKER + token + r"N(\d+)\s*(?:</[^>]+>\s*)*</p>"
+    )
+    matches = list(marker.finditer(html))
+    if [int(m.group(1)) for m in matches] != list(range(count - 1)):
+        return None
+    if html.count(BATCH_MARKER + token) != count - 1:
+        return None
+    pieces, pos = [], 0
+    for m in matches:
+        pieces.append(html[pos : m.start()].strip())
+        pos = m.end()
+    pieces.append(html[pos:].strip())
+    return pieces
+
+
+_RTF_HEADER = re.compile(r"\s*\{\\rtf\d*")
+
+
+def _batch_group(raw: bytes) -> str:
+    """A note's RTF as a plain group: pandoc rejects a {\\rtf1 ...} document nested in another."""
+    s = _decode_rtf(raw)
+    m = _RTF_HEADER.match(s)
+    if m:
+        s = s[m.end() :].rstrip("\x00 \t\r\n")
+        s = s[:-1] if s.endswith("}") else s
+    return "{" + s + "}"
+
+
+def convert_rtf_batch(payloads: list[bytes]) -> list[Tuple[Optional[str], str, Optional[list]]]:
+    """Convert several notes in one pandoc run; fall back to per-note conversion if the split fails."""
+    if len(payloads) < 2 or not (HAS_PANDOC or _pandoc_pool is not None):
+        return [rtf_to_html_text_blocks(p) for p in payloads]
+    token = uuid.uuid4().hex.upper()
+    parts = []
+    for i, raw in enumerate(payloads):
+        if i:
+            # \pard only resets formatting; the \par closes a last line that has none of its own
+            parts.append(f"\\par{{\\pard\\plain {BATCH_MARKER}{token}N{i - 1}\\par}}")
+        parts.append(_batch_group(raw))
+    combined = "{\\rtf1\\ansi\n" + "\n".join(parts) + "\n}"
+    with _batch_stats_lock:
+        batch_stats["batches"] += 1
+        batch_stats["notes"] += len(payloads)
+    try:
+        pieces = _split_batch_html(pandoc_convert(combined, "html"), token, len(payloads))
+    except Exception:
+        pieces = None
+    if pieces is None:
+        with _batch_stats_lock:
+            batch_stats["fallbacks"] += 1
+        return [rtf_to_html_text_blocks(p) for p in payloads]
+    results = []
+    for raw, piece in zip(payloads, pieces):
+        # Empty pieces are re-run alone so they get the same plain-text fallback as usual
+        # pandoc ends a document with a newline; add it back so the text matches a lone run
+        results.append(_html_result(piece + "\n") if piece else rtf_to_html_text_blocks(raw))
+    return results
+
+
+def convert_rtf_many(
+    payloads: list[bytes], batch: int = 0
+) -> list[Tuple[Optional[str], str, Optional[list]]]:
+    if batch <= 1:
+        return pandoc_map(rtf_to_html_text_blocks, payloads)
+    groups = [payloads[i : i + batch] for i in range(0, len(payloads), batch)]
+    return [r for group in pandoc_map(convert_rtf_batch, groups) for r in group]
+
+
+# --- Native converter for the Stickies RTF subset ---
+
+
+class NativeRTFUnsupported(Exception):
+    """Raised when a note uses RTF the native converter does not understand."""
+
+
+_RTF_TOKEN = re.compile(
+    rb"\\([a-zA-Z]+)(-?\d+)? ?|\\'([0-9a-fA-F]{2})|\\([^a-zA-Z])|([{}])|[\r\n]+|([^\\{}\r\n]+)"
+)
+
+# Destinations whose content never reaches the page body
+_RTF_SKIP_DESTINATIONS = set(
+    "fonttbl colortbl expandedcolortbl stylesheet info listtable listoverridetable header footer".split()
+)
+
+# Control words that only affect layout or styling Notion can't represent
+_RTF_IGNORED_WORDS = set("""
+    rtf ansi mac pc pca ansicpg deff deflang deftab cocoartf cocoatextscaling cocoaplatform
+    cocoasubrtf paperw paperh margl margr margt margb vieww viewh viewkind
+    f fs cf cb highlight expnd expndtw kerning outl shad strokewidth strokec nosupersub up dn
+    pard tx li fi ri ql qc qr qj sl slmult sa sb partightenfactor pardirnatural pardeftab
+    ilvl ltrch rtlch ltrpar rtlpar lang langfe noproof itap hyphauto
+    """.split())
+
+
+def rtf_to_blocks_native(rtf_bytes: bytes) -> Tuple[str, list]:
+    """Convert Stickies' Cocoa RTF straight to (plain_text, notion_blocks) in one pass.
+
+    Raises NativeRTFUnsupported for anything outside the subset so callers can use pandoc.
+    """
+    codec = "cp1252"
+    blocks: list = []
+    lines: list[str] = []
+    runs: list[list] = []  # [text, (bold, italic, underline, strike)]
+    listtext: list[str] = []
+    list_kind: Optional[str] = None
+    state = {
+        "b": False,
+        "i": False,
+        "ul": False,
+        "strike": False,
+        "skip": False,
+        "dest": None,
+        "uc": 1,
+    }
+    stack: list[dict] = []
+    skip_chars = 0
+    high_surrogate: Optional[int] = None
+
+    def emit(text: str):
+        nonlocal skip_chars
+        if skip_chars:
+            drop = min(skip_chars, len(text))
+            text, skip_chars = text[drop:], skip_chars - drop
+        if not text or state["skip"]:
+            return
+        if state["dest"] == "listtext":
+            listtext.append(text)
+            return
+        key = (state["b"], state["i"], state["ul"], state["strike"])
+        if runs and runs[-1][1] == key:
+            runs[-1][0] += text
+        else:
+            runs.append([text, key])
+
+    def end_paragraph():
+        nonlocal list_kind
+        text = "".join(r[0] for r in runs)
+        marker = "".join(listtext).strip()
+        if list_kind or marker:
+            t = "numbered_list_item" if re.match(r"\d+[.)]?$", marker) else "bulleted_list_item"
+        else:
+            t = "paragraph"
+        if text.strip() or t != "paragraph":
+            rich = []
+            for content, (b, i, ul, strike) in runs:
+                content = clean_unicode_text(content)
+                for c in chunk_text(content, 1500)[:50]:
+                    rich.append(_text_obj(c, bold=b, italic=i, underline=ul, strikethrough=strike))
+            blocks.append({"object": "block", "type": t, t: {"rich_text": rich[:80]}})
+            # Broken at formatting changes, as get_text("\n") breaks pandoc's HTML, so the
+            # Import Hash and title match --converter pandoc
+            lines.append("\n".join(r[0] for r in runs))
+        runs.clear()
+        listtext.clear()
+
+    for m in _RTF_TOKEN.finditer(rtf_bytes):
+        word, arg, hexbyte, symbol, brace, text = m.groups()
+        if m.lastindex is None:
+            continue  # bare line breaks carry no meaning in RTF
+        if text is not None:
+            emit(text.decode(codec, errors="replace"))
+        elif brace is not None:
+            if brace == b"{":
+                stack.append(dict(state))
+            elif stack:
+                state = stack.pop()
+        elif hexbyte is not None:
+            emit(bytes([int(hexbyte, 16)]).decode(codec, errors="replace"))
+        elif symbol is not None:
+            sym = symbol.decode("latin-1")
+            if sym == "*":
+                state["skip"] = True
+            elif sym in ("\n", "\r"):
+                if not state["skip"]:
+                    end_paragraph()
+            elif sym in ("\\", "{", "}"):
+                emit(sym)
+            elif sym == "~":
+                emit("\u00a0")
+            elif sym in ("-", ":"):
+                pass
+            elif sym == "_":
+                emit("\u2011")
+            else:
+                raise NativeRTFUnsupported(f"control symbol \\{sym}")
+        else:
+            w = word.decode("ascii")
+            n = int(arg) if arg is not None else None
+            if state["skip"]:
+                continue
+            if w in _RTF_SKIP_DESTINATIONS:
+                state["skip"] = True
+            elif w == "ansicpg" and n:
+                codec = f"cp{n}"
+            elif w == "listtext":
+                state["dest"] = "listtext"
+            elif w in ("par", "line"):
+                end_paragraph()
+            elif w == "pard":
+                list_kind = None
+            elif w == "ls":
+                list_kind = "list"
+            elif w == "plain":
+                state.update(b=False, i=False, ul=False, strike=False)
+            elif w in ("b", "i", "strike"):
+                state[w] = n != 0
+            elif w == "ul":
+                state["ul"] = n != 0
+            elif w == "ulnone":
+                state["ul"] = False
+            elif w == "striked":
+                state["strike"] = n != 0
+            elif w == "uc":
+                state["uc"] = n or 0
+            elif w == "u":
+                cp = n + 65536 if n < 0 else n
+                if 0xD800 <= cp <= 0xDBFF:
+                    high_surrogate = cp
+                else:
+                    if high_surrogate is not None and 0xDC00 <= cp <= 0xDFFF:
+                        cp = 0x10000 + ((high_surrogate - 0xD800) << 10) + (cp - 0xDC00)
+                    high_surrogate = None
+                    emit(chr(cp))
+                skip_chars = state["uc"]
+            elif w == "tab":
+                emit("\t")
+            elif w in ("emdash", "endash", "bullet", "lquote", "rquote", "ldblquote", "rdblquote"):
+                emit(
+                    {
+                        "emdash": "\u2014",
+                        "endash": "\u2013",
+                        "bullet": "\u2022",
+                        "lquote": "\u2018",
+                        "rquote": "\u2019",
+                        "ldblquote": "\u201c",
+                        "rdblquote": "\u201d",
+                    }[w]
+                )
+            elif w in _RTF_IGNORED_WORDS or w.lower().startswith("cocoa"):
+                pass
+            else:
+                raise NativeRTFUnsupported(f"control word \\{w}")
+
+    if runs:
+        end_paragraph()
+    if not blocks:
+        blocks.append(
+            {"object": "block", "type": "paragraph", "paragraph": {"rich_text": [_text_obj("")]}}
+        )
+    return clean_unicode_text("\n".join(lines)), blocks
+
+
+# --- Pandoc JSON AST converter ---
+
+_AST_MARKS = {
+    "Strong": "bold",
+    "Emph": "italic",
+    "Underline": "underline",
+    "Strikeout": "strikethrough",
+}
+_AST_HEADINGS = {1: "heading_1", 2: "heading_2", 3: "heading_3"}
+_AST_QUOTES = {"SingleQuote": ("\u2018", "\u2019"), "DoubleQuote": ("\u201c", "\u201d")}
+# Inlines pandoc's HTML writer wraps in an element without changing the run's formatting
+_AST_WRAPPED = ("Link", "Image", "Span", "Cite", "SmallCaps", "Superscript", "Subscript")
+
+
+def _ast_inlines(inlines: list, ann: dict, out: list):
+    """Flatten pandoc inlines into [text, annotations] runs, merging equal neighbours."""
+    for node in inlines:
+        t, c = node.get("t"), node.get("c")
+        run_ann = ann
+        if t == "Str":
+            text = c
+        elif t in ("Space", "SoftBreak"):
+            text = " "
+        elif t == "LineBreak":
+            text = "\n"
+        elif t == "Code":
+            text = c[1]
+            run_ann = {**ann, "code": True}
+        elif t in _AST_MARKS:
+            _ast_inlines(c, {**ann, _AST_MARKS[t]: True}, out)
+            continue
+        elif t == "Quoted":
+            open_q, close_q = _AST_QUOTES.get(c[0].get("t"), ('"', '"'))
+            _ast_inlines([{"t": "Str", "c": open_q}, *c[1], {"t": "Str", "c": close_q}], ann, out)
+            continue
+        elif t in _AST_WRAPPED or t == "Math":
+            # Empty runs mark the element's edges, where _ast_text breaks the text like
+            # get_text("\n") does on the HTML route
+            if t == "Math":
+                inner = [{"t": "Str", "c": c[1]}]
+            elif t in ("Link", "Image"):
+                inner = c[1]
+            elif t in ("Span", "Cite"):
+                inner = c[-1]
+            else:
+                inner = c
+            out.append(["", ann])
+            _ast_inlines(inner, ann, out)
+            out.append(["", ann])
+            continue
+        else:
+            continue  # Note, RawInline: nothing to show in the page body
+        if out and out[-1][1] == run_ann:
+            out[-1][0] += text
+        else:
+            out.append([text, run_ann])
+
+
+def _ast_text(runs: list) -> str:
+    """Plain text of runs, broken at formatting changes and element edges as on the HTML route.
+
+    Import Hashes and titles come from this text, so it has to match what --converter pandoc
+    derives from the same note.
+    """
+    return "\n".join(text for text, _ in runs if text)
+
+
+def _ast_rich_text(runs: list) -> list:
+    rich = []
+    for text, ann in runs:
+        if not text:
+            continue
+        for c in chunk_text(clean_unicode_text(text), 1500)[:50]:
+            rich.append(_text_obj(c, **ann))
+    return rich[:80]
+
+
+class AstUnsupported(Exception):
+    """Raised for pandoc blocks the AST converter has no mapping for (the HTML route takes over)."""
+
+
+def _ast_nested_runs(nodes: list, runs: list):
+    """Append the text of blocks nested in a list item or quote, one line per block."""
+    for sub in nodes:
+        t, c = sub.get("t"), sub.get("c")
+        if t in ("Para", "Plain", "Header", "CodeBlock"):
+            if runs:
+                _ast_inlines([{"t": "LineBreak"}], {}, runs)
+            if t == "Header":
+                _ast_inlines(c[2], {}, runs)
+            elif t == "CodeBlock":
+                _ast_inlines([{"t": "Code", "c": c}], {}, runs)
+            else:
+                _ast_inlines(c, {}, runs)
+        elif t in ("BulletList", "OrderedList"):
+            for item in c if t == "BulletList" else c[1]:
+                _ast_nested_runs(item, runs)
+        elif t == "LineBlock":
+            _ast_nested_runs([{"t": "Para", "c": ln} for ln in c], runs)
+        elif t == "Div":
+            _ast_nested_runs(c[1], runs)
+        elif t == "BlockQuote":
+            _ast_nested_runs(c, runs)
+        elif t not in ("Null", "RawBlock", "HorizontalRule"):
+            raise AstUnsupported(f"pandoc block {t}")
+
+
+def _ast_blocks(nodes: list, blocks: list, lines: list):
+    for node in nodes:
+        t, c = node.get("t"), node.get("c")
+        if t in ("Para", "Plain"):
+            runs: list = []
+            _ast_inlines(c, {}, runs)
+            text = _ast_text(runs)
+            if text.strip():
+                blocks.append(
+                    {
+                        "object": "block",
+                        "type": "paragraph",
+                        "paragraph": {"rich_text": _ast_rich_text(runs)},
+                    }
+                )
+                lines.append(text)
+        elif t == "Header":
+            level, _, inlines = c
+            runs = []
+            _ast_inlines(inlines, {}, runs)
+            bt = _AST_HEADINGS.get(level, "paragraph")
+            blocks.append({"object": "block", "type": bt, bt: {"rich_text": _ast_rich_text(runs)}})
+            lines.append(_ast_text(runs))
+        elif t in ("BulletList", "OrderedList"):
+            bt = "bulleted_list_item" if t == "BulletList" else "numbered_list_item"
+            for item in c if t == "BulletList" else c[1]:
+                # Like html_to_blocks, everything inside one <li> (nested lists included)
+                # becomes one list item
+                runs = []
+                _ast_nested_runs(item, runs)
+                blocks.append(
+                    {"object": "block", "type": bt, bt: {"rich_text": _ast_rich_text(runs)}}
+                )
+                lines.append(_ast_text(runs))
+        elif t == "CodeBlock":
+            blocks.append(
+                {
+                    "object": "block",
+                    "type": "code",
+                    "code": {"language": "plain text", "rich_text": [_text_obj(c[1])]},
+                }
+            )
+            lines.append(c[1])
+        elif t == "BlockQuote":
+            runs = []
+            _ast_nested_runs(c, runs)
+            blocks.append(
+                {"object": "block", "type": "quote", "quote": {"rich_text": _ast_rich_text(runs)}}
+            )
+            lines.append(_ast_text(runs))
+        elif t == "Div":
+            _ast_blocks(c[1], blocks, lines)
+        elif t == "LineBlock":
+            _ast_blocks([{"t": "Para", "c": ln} for ln in c], blocks, lines)
+        elif t == "HorizontalRule":
+            blocks.append({"object": "block", "type": "divider", "divider": {}})
+        elif t not in ("Null", "RawBlock"):
+            # Tables, definition lists, figures: rather than drop them, let the HTML route convert
+            raise AstUnsupported(f"pandoc block {t}")
+
+
+def rtf_to_blocks_pandoc_json(rtf_bytes: bytes) -> Tuple[str, list]:
+    """Convert via pandoc's JSON AST to (plain_text, notion_blocks), skipping HTML entirely."""
+    doc = json.loads(pandoc_convert(_decode_rtf(rtf_bytes), "json"))
+    blocks: list = []
+    lines: list[str] = []
+    _ast_blocks(doc.get("blocks", []), blocks, lines)
+    if not blocks:
+        blocks.append(
+            {"object": "block", "type": "paragraph", "paragraph": {"rich_text": [_text_obj("")]}}
+        )
+    return clean_unicode_text("\n".join(lines)), blocks
+
+
+# --- Formatting triage ---
+
+_TRIAGE_WORD = re.compile(rb"\\([a-zA-Z]+)(-?\d+)?")
+# Character formatting that only counts when switched on (\b, \b1 — not \b0)
+_TRIAGE_FORMAT_WORDS = {b"b", b"i", b"ul", b"strike", b"striked", b"super", b"sub"}
+# Structures a control-word stripper would lose
+_TRIAGE_COMPLEX_WORDS = {
+    b"field",
+    b"fldinst",
+    b"pict",
+    b"NeXTGraphic",
+    b"object",
+    b"shp",
+    b"trowd",
+    b"footnote",
+}
+
+
+def classify_rtf(rtf_bytes: bytes) -> str:
+    """Classify a payload as 'plain', 'simple' or 'complex' from its control words alone."""
+    kind = "plain"
+    for word, arg in _TRIAGE_WORD.findall(rtf_bytes):
+        if word in _TRIAGE_COMPLEX_WORDS:
+            return "complex"
+        if word == b"listtext" or (word in _TRIAGE_FORMAT_WORDS and arg != b"0"):
+            kind = "simple"
+    return kind
+
+
+# --- Conversion stage ---
+
+
+@dataclass
+class ConvertOptions:
+    converter: str = "pandoc"
+    pandoc_batch: int = 0
+    jobs: int = 1
+    triage: bool = False
+    html_parser: str = "auto"
+
+
+@dataclass
+class ConvertedText:
+    """Conversion output for one note, as returned from (possibly remote) workers."""
+
+    title: str
+    html: Optional[str]
+    plain: str
+    blocks: Optional[list] = None
+    route: str = "pandoc"
+    error: Optional[str] = None
+    kind: Optional[str] = None  # triage class, when --triage is on
+    seconds: float = 0.0
+
+
+def conversion_is_final(c: ConvertedText) -> bool:
+    """False for results of one-off failures, which are converted again on the next run."""
+    if c.error:
+        return False
+    # Text-only while pandoc was available means pandoc failed (timeout, crash)
+    pandoc_expected = HAS_PANDOC or _pandoc_pool is not None
+    return not (pandoc_expected and c.html is None and c.blocks is None)
+
+
+conversion_stats: dict[str, int] = {}
+triage_stats: dict[str, list] = {}  # kind -> [count, seconds]
+
+
+def finish_note_text(
+    html: Optional[str], plain: str, fallback_title: str = "", cleaned: bool = True
+) -> Tuple[str, Optional[str], str]:
+    """Derive the title from converter output; returns (title, html, plain).
+
+    Converters already run clean_unicode_text on what they return, so the text is only
+    cleaned here when the caller passes cleaned=False.
+    """
+    if not cleaned:
+        plain = clean_unicode_text(plain) if plain else ""
+        html = clean_unicode_text(html) if html else None
+    title = truncate_title(first_nonempty_line(plain or "") or clean_unicode_text(fallback_title))
+    return title, html, plain or ""
+
+
+def _convert_group(items: list[Tuple[bytes, str]], opts: ConvertOptions) -> list[ConvertedText]:
+    """Convert (raw, fallback_title) items, isolating failures to the note that caused them.
+
+    Runs inside worker processes under --jobs.
+    """
+    use_html_parser(opts.html_parser)  # worker processes don't inherit main's selection
+    n = len(items)
+    results: list = [None] * n
+    seconds = [0.0] * n
+    kinds = [classify_rtf(raw) if opts.triage else None for raw, _ in items]
+    direct = {"native": rtf_to_blocks_native, "pandoc-json": rtf_to_blocks_pandoc_json}
+    # Plain notes need no more than the native tokenizer, whatever the chosen converter
+    fn_names = ["native" if kind == "plain" else opts.converter for kind in kinds]
+    todo = [i for i in range(n) if fn_names[i] not in direct]
+
+    def convert_direct(i: int) -> bool:
+        t0 = time.perf_counter()
+        try:
+            plain, blocks = direct[fn_names[i]](items[i][0])
+            results[i] = (None, plain, blocks, fn_names[i])
+        except Exception:
+            pass
+        seconds[i] += time.perf_counter() - t0
+        return results[i] is not None
+
+    tried = [i for i in range(n) if fn_names[i] in direct]
+    todo += [i for i, ok in zip(tried, pandoc_map(convert_direct, tried)) if not ok]
+
+    t0 = time.perf_counter()
+    try:
+        converted = convert_rtf_many([items[i][0] for i in todo], opts.pandoc_batch)
+    except Exception:
+        converted = [None] * len(todo)
+    share = (time.perf_counter() - t0) / len(todo) if todo else 0.0
+    for i, conv in zip(todo, converted):
+        seconds[i] += share
+        if conv is not None:
+            if opts.converter in direct or kinds[i] == "plain":
+                route = f"{'native' if kinds[i] == 'plain' else opts.converter}-fallback"
+            else:
+                route = "pandoc" if conv[0] else "plain"
+            results[i] = (conv[0], conv[1], conv[2], route)
+
+    out = []
+    for (raw, fallback_title), res, kind, secs in zip(items, results, kinds, seconds):
+        t0 = time.perf_counter()
+        try:
+            if res is None:
+                html, plain, blocks = rtf_to_html_text_blocks(raw)
+                res = (html, plain, blocks, "pandoc" if html else "plain")
+            html, plain, blocks, route = res
+            title, html, plain = finish_note_text(html, plain, fallback_title)
+            c = ConvertedText(title, html, plain, blocks, route, kind=kind)
+        except Exception as e:
+            try:
+                plain = _rtf_fallback_text(_decode_rtf(raw))
+            except Exception:
+                plain = ""
+            title, _, plain = finish_note_text(None, plain, fallback_title)
+            c = ConvertedText(title, None, plain, None, "error", f"{type(e).__name__}: {e}", kind)
+        c.seconds = secs + time.perf_counter() - t0
+        out.append(c)
+    return out
+
+
+# --- Conversion cache ---
+
+
+def _pandoc_version() -> str:
+    try:
+        if HAS_PANDOC:
+            return pypandoc.get_pandoc_version()
+        path = shutil.which("pandoc")
+        if path:
+            out = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10)
+            return out.stdout.split("\n", 1)[0]
+    except Exception:
+        pass
+    return "none"
+
+
+def default_cache_dir() -> str:
+    if sys.platform == "darwin":
+        return "~/Library/Caches/stickies-importer"
+    return os.path.join(os.environ.get("XDG_CACHE_HOME", "~/.cache"), "stickies-importer")
+
+
+# Bump when a converter's output changes so results cached by older code are redone
+CONVERTER_REVISION = 2
+
+
+class ConversionCache:
+    """SQLite store of conversion results keyed by RTF content hash and converter settings."""
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = cache_dir / "conversions.sqlite3"
+        self.max_bytes = max_bytes
+        self.db = sqlite3.connect(str(self.path))
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS conversions ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS conversions_last_used ON conversions (last_used)"
+        )
+        self.versions = f"{VERSION}|r{CONVERTER_REVISION}|pandoc {_pandoc_version()}"
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, raw: bytes, opts: ConvertOptions) -> str:
+        settings = f"{opts.converter}|triage={int(opts.triage)}|{self.versions}"
+        return hashlib.sha256(raw).hexdigest() + "|" + settings
+
+    def get_many(self, keys: list[str]) -> dict[str, ConvertedText]:
+        found: dict[str, ConvertedText] = {}
+        for i in range(0, len(keys), 500):
+            chunk = keys[i : i + 500]
+            rows = self.db.execute(
+                f"SELECT key, value FROM conversions WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            for key, value in rows:
+                d = json.loads(zlib.decompress(value))
+                found[key] = ConvertedText(
+                    d["title"], d["html"], d["plain"], d["blocks"], d["route"], kind=d["kind"]
+                )
+        now = time.time()
+        self.db.executemany(
+            "UPDATE conversions SET last_used = ? WHERE key = ?", [(now, k) for k in found]
+        )
+        self.db.commit()
+        self.hits += len(found)
+        self.misses += len(set(keys) - set(found))
+        return found
+
+    def put_many(self, pairs: list[Tuple[str, ConvertedText]]):
+        now = time.time()
+        rows = []
+        for key, c in pairs:
+            if not conversion_is_final(c):
+                continue
+            value = zlib.compress(
+                json.dumps(
+                    {
+                        "title": c.title,
+                        "html": c.html,
+                        "plain": c.plain,
+                        "blocks": c.blocks,
+                        "route": c.route,
+                        "kind": c.kind,
+                    }
+                ).encode("utf-8")
+            )
+            rows.append((key, value, len(value), now))
+        self.db.executemany("INSERT OR REPLACE INTO conversions VALUES (?, ?, ?, ?)", rows)
+        self.db.commit()
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        (total,) = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM conversions").fetchone()
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        doomed = []
+        for key, size in self.db.execute("SELECT key, size FROM conversions ORDER BY last_used"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self.db.executemany("DELETE FROM conversions WHERE key = ?", doomed)
+        self.db.commit()
+        self.evictions += len(doomed)
+
+    def close(self):
+        self.db.close()
+
+
+_conversion_cache: Optional[ConversionCache] = None
+
 
-    # Remove or replace problematic characters
-    text = text.encode("utf-8", errors="ignore").decode("utf-8")  # Remove invalid UTF-8
-    text = unicodedata.normalize("NFKC", text)  # Normalize Unicode
+def open_conversion_cache(cache_dir: str, max_mb: int) -> ConversionCache:
+    """Open the shared cache consulted by convert_notes."""
+    global _conversion_cache
+    _conversion_cache = ConversionCache(Path(os.path.expanduser(cache_dir)), max_mb * 1024 * 1024)
+    atexit.register(_conversion_cache.close)
+    return _conversion_cache
 
-    # Remove surrogate pairs and other problematic characters
-    cleaned_chars = []
-    for char in text:
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool(jobs: int) -> ProcessPoolExecutor:
+    """Reuse one worker pool across convert_notes calls so streamed windows don't respawn it."""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=jobs, initializer=_forget_pandoc_pool)
+        atexit.register(_shutdown_process_pool)
+    return _process_pool
+
+
+def _forget_pandoc_pool():
+    # A forked worker inherits the parent's pool, whose servers it can't see and would restart
+    # without ever stopping them; workers use pypandoc instead
+    global _pandoc_pool
+    _pandoc_pool = None
+
+
+def _shutdown_process_pool():
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+
+
+def _picklable(raw) -> bytes:
+    return raw if isinstance(raw, bytes) else bytes(raw)
+
+
+def _convert_uncached(items: list[Tuple[bytes, str]], opts: ConvertOptions) -> list[ConvertedText]:
+    size = max(opts.pandoc_batch, 1)
+    groups = [items[i : i + size] for i in range(0, len(items), size)]
+    results: list[ConvertedText] = []
+    if opts.jobs <= 1 or len(groups) < 2:
+        for g in groups:
+            results.extend(_convert_group(g, opts))
+    else:
+        # Views and mappings can't be pickled, so only here do payloads become bytes copies
+        groups = [[(_picklable(raw), t) for raw, t in g] for g in groups]
+        done = 0
         try:
-            # Test if character can be encoded
-            char.encode("utf-8")
-            # Skip surrogate pairs
-            if 0xD800 <= ord(char) <= 0xDFFF:
+            ex = _get_process_pool(opts.jobs)
+            chunksize = max(1, len(groups) // (opts.jobs * 8))
+            for out in ex.map(_convert_group, groups, [opts] * len(groups), chunksize=chunksize):
+                results.extend(out)
+                done += 1
+        except BrokenProcessPool as e:
+            # A worker process died (e.g. killed by the OS); finish the rest in this process
+            print(f"Warning: conversion worker pool failed ({e}); continuing without --jobs")
+            _shutdown_process_pool()
+            opts.jobs = 1
+            for g in groups[done:]:
+                results.extend(_convert_group(g, opts))
+    for r in results:
+        conversion_stats[r.route] = conversion_stats.get(r.route, 0) + 1
+        if r.kind:
+            entry = triage_stats.setdefault(r.kind, [0, 0.0])
+            entry[0] += 1
+            entry[1] += r.seconds
+    return results
+
+
+def convert_notes(
+    items: list[Tuple[bytes, str]], opts: Optional[ConvertOptions] = None
+) -> list[ConvertedText]:
+    """Convert notes in source order, reusing cached results and optionally a process pool."""
+    opts = opts or ConvertOptions()
+    cache = _conversion_cache
+    if cache is None:
+        return _convert_uncached(items, opts)
+    keys = [cache.key(raw, opts) for raw, _ in items]
+    cached = cache.get_many(keys)
+    missing = [i for i, k in enumerate(keys) if k not in cached]
+    fresh = _convert_uncached([items[i] for i in missing], opts)
+    cache.put_many([(keys[i], c) for i, c in zip(missing, fresh)])
+    results: list = [cached.get(k) for k in keys]
+    for i, c in zip(missing, fresh):
+        results[i] = c
+    return results
+
+
+class LazyStickyNote(StickyNote):
+    """A StickyNote that keeps its raw RTF and converts it the first time html, plain,
+    title or blocks is read. convert_lazy_notes converts many at once."""
+
+    def __init__(
+        self,
+        raw: bytes,
+        created: dt.datetime,
+        modified: dt.datetime,
+        source_id: str,
+        color: Optional[str] = None,
+        fallback_title: str = "",
+        opts: Optional[ConvertOptions] = None,
+    ):
+        self.raw: Optional[bytes] = raw
+        self.created = created
+        self.modified = modified
+        self.source_id = source_id
+        self.color = color
+        self.fallback_title = fallback_title
+        self.opts = opts
+        self.converted: Optional[ConvertedText] = None
+        self.source_state: Optional[Tuple[tuple, str]] = None  # (fingerprint, content hash)
+
+    def _conversion(self) -> ConvertedText:
+        if self.converted is None:
+            convert_lazy_notes([self])
+        return self.converted
+
+    title = property(lambda self: self._conversion().title)
+    html = property(lambda self: self._conversion().html)
+    plain = property(lambda self: self._conversion().plain)
+    blocks = property(lambda self: self._conversion().blocks)
+
+
+def convert_lazy_notes(notes: list) -> None:
+    """Convert every pending LazyStickyNote in one convert_notes call (batching, --jobs, cache)."""
+    pending = [n for n in notes if isinstance(n, LazyStickyNote) and n.converted is None]
+    if not pending:
+        return
+    converted = convert_notes([(n.raw, n.fallback_title) for n in pending], pending[0].opts)
+    for n, c in zip(pending, converted):
+        if c.error:
+            print(f"Warning: could not convert {n.source_id}: {c.error}")
+        n.converted = c
+        n.raw = None  # the converted text replaces the RTF
+
+
+# --- Streaming binary plist reader ---
+
+_RTF_KEY = re.compile(r"rtf|nsrtf|rtfd|textdata", re.I)
+_PLIST_EPOCH = dt.datetime(2001, 1, 1)  # NSDate reference date; naive like plistlib's
+_NSDATE_EPOCH = _PLIST_EPOCH.replace(tzinfo=dt.timezone.utc)  # for archived NSDate objects
+
+
+class BinaryPlist:
+    """Memory-mapped binary plist that decodes objects on demand through its offset table.
+
+    Nothing is decoded up front, so peak memory does not grow with the file. Data objects are
+    returned as memoryviews into the mapping rather than copies.
+    """
+
+    # Object kinds (high nibble of the marker byte)
+    SIMPLE, INT, REAL, DATE, DATA, ASCII, UTF16, UID = 0x0, 0x1, 0x2, 0x3, 0x4, 0x5, 0x6, 0x8
+    ARRAY, SET, DICT = 0xA, 0xC, 0xD
+    _UNSIGNED = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = self._buf = memoryview(self._mm)
+        if len(buf) < 40 or buf[:8] != b"bplist00":
+            raise ValueError(f"{path} is not a binary plist")
+        self._offset_size, self._ref_size, self.num_objects, self.top, self._table = struct.unpack(
+            ">6xBBQQQ", buf[-32:]
+        )
+        self._ref_code = self._UNSIGNED.get(self._ref_size)
+
+    def _int(self, pos: int, size: int) -> int:
+        code = self._UNSIGNED.get(size)
+        if code:
+            return struct.unpack_from(">" + code, self._buf, pos)[0]
+        return int.from_bytes(self._buf[pos : pos + size], "big")
+
+    def ref_at(self, pos: int, i: int) -> int:
+        """Return the i-th object reference of a reference list starting at pos."""
+        return self._int(pos + i * self._ref_size, self._ref_size)
+
+    def _header(self, ref: int) -> Tuple[int, int, int]:
+        """Return (kind, count or size bits, position of the payload) for an object."""
+        pos = self._int(self._table + ref * self._offset_size, self._offset_size)
+        marker = self._buf[pos]
+        kind, info = marker >> 4, marker & 0xF
+        pos += 1
+        if info == 0xF and kind in (
+            self.DATA,
+            self.ASCII,
+            self.UTF16,
+            self.ARRAY,
+            self.SET,
+            self.DICT,
+        ):
+            size = 1 << (self._buf[pos] & 0xF)
+            info = self._int(pos + 1, size)
+            pos += 1 + size
+        return kind, info, pos
+
+    def _refs(self, pos: int, count: int) -> list[int]:
+        if self._ref_code:
+            return list(struct.unpack_from(f">{count}{self._ref_code}", self._buf, pos))
+        return [self.ref_at(pos, i) for i in range(count)]
+
+    def container(self, ref: int) -> Tuple[int, int, int]:
+        """Return (kind, count, position of the reference list) for an object."""
+        return self._header(ref)
+
+    def children(self, ref: int) -> Tuple[list[int], list[int]]:
+        """Return (key refs, value refs) of a dict, ([], element refs) of an array or set."""
+        kind, count, pos = self._header(ref)
+        if kind == self.DICT:
+            return self._refs(pos, count), self._refs(pos + count * self._ref_size, count)
+        if kind in (self.ARRAY, self.SET):
+            return [], self._refs(pos, count)
+        return [], []
+
+    def value(self, ref: int, depth: int = 0):
+        """Decode one object; containers nested deeper than `depth` levels come back as None."""
+        kind, info, pos = self._header(ref)
+        buf = self._buf
+        if kind == self.SIMPLE:
+            return {0x8: False, 0x9: True}.get(info)
+        if kind == self.INT:
+            size = 1 << info
+            return int.from_bytes(buf[pos : pos + size], "big", signed=size >= 8)
+        if kind == self.REAL:
+            return struct.unpack(">f" if info == 2 else ">d", buf[pos : pos + (1 << info)])[0]
+        if kind == self.DATE:
+            return _PLIST_EPOCH + dt.timedelta(seconds=struct.unpack(">d", buf[pos : pos + 8])[0])
+        if kind == self.DATA:
+            return buf[pos : pos + info]
+        if kind == self.ASCII:
+            return str(buf[pos : pos + info], "ascii")
+        if kind == self.UTF16:
+            return str(buf[pos : pos + 2 * info], "utf-16-be")
+        if kind == self.UID:
+            return plistlib.UID(self._int(pos, info + 1))
+        if depth <= 0:
+            return None
+        keys, vals = self.children(ref)
+        if kind == self.DICT:
+            return {self.value(k): self.value(v, depth - 1) for k, v in zip(keys, vals)}
+        return [self.value(v, depth - 1) for v in vals]
+
+
+def _iter_bplist_candidates(plist: BinaryPlist) -> Iterator[dict]:
+    """Yield note-like dicts from a binary plist, decoding only their keys and scalar fields."""
+    seen = bytearray(plist.num_objects)
+    stack = [plist.top]
+    while stack:
+        ref = stack.pop()
+        if seen[ref]:
+            continue
+        seen[ref] = 1
+        keys, vals = plist.children(ref)
+        if keys:
+            names = [plist.value(k) for k in keys]
+            if any(isinstance(k, str) and _RTF_KEY.search(k) for k in names):
+                # One level deep is enough for wrapped data such as {"NS.data": ...}
+                yield {k: plist.value(v, depth=1) for k, v in zip(names, vals)}
+        stack.extend(reversed(vals))  # depth-first, in document order
+
+
+# --- NSKeyedArchiver decoder ---
+
+_DATE_ROLES = (
+    ("created", re.compile(r"creat|birth", re.I)),
+    ("modified", re.compile(r"modif|update", re.I)),
+)
+_ID_KEY = re.compile(r"uuid|identifier|^(ns\.)?id$", re.I)
+# Classes Stickies archives its notes as; subclasses are matched through $classes
+KEYED_NOTE_CLASSES = frozenset({"Document", "StickiesDocument"})
+
+
+class KeyedArchive:
+    """NSKeyedArchiver archive read from a BinaryPlist by following `$objects` UIDs.
+
+    Every archived object lives flat in `$objects`, so records are visited in one linear pass
+    with no recursion. Fields are decoded only when asked for.
+    """
+
+    def __init__(self, plist: BinaryPlist, objects_ref: int):
+        self.plist = plist
+        _, self.num_objects, self._objects_pos = plist.container(objects_ref)
+        self._keys: dict[int, str] = {}  # key strings are shared objects in a binary plist
+        self._classnames: dict[int, str] = {}
+        self._note_classes: dict[int, bool] = {}
+        self._roles: dict[tuple, Optional[dict]] = {}
+        self.skipped_classes: set[str] = set()  # RTF-carrying classes not in KEYED_NOTE_CLASSES
+
+    @classmethod
+    def open(cls, plist: BinaryPlist) -> Optional["KeyedArchive"]:
+        """Return the archive view, or None if the plist is not a keyed archive."""
+        keys, vals = plist.children(plist.top)
+        top = dict(zip((plist.value(k) for k in keys), vals))
+        if "$objects" not in top or "$top" not in top:
+            return None
+        return cls(plist, top["$objects"])
+
+    def object_ref(self, idx: int) -> int:
+        return self.plist.ref_at(self._objects_pos, idx)
+
+    def classname(self, uid: plistlib.UID) -> str:
+        if uid.data not in self._classnames:
+            cls = None
+            if 0 < uid.data < self.num_objects:  # depth 2 to reach the $classes list
+                cls = self.plist.value(self.object_ref(uid.data), depth=2)
+            cls = cls if isinstance(cls, dict) else {}
+            name = cls.get("$classname", "")
+            hierarchy = cls.get("$classes")
+            self._classnames[uid.data] = name
+            self._note_classes[uid.data] = not KEYED_NOTE_CLASSES.isdisjoint(
+                hierarchy if isinstance(hierarchy, list) else [name]
+            )
+        return self._classnames[uid.data]
+
+    def is_note_class(self, uid: plistlib.UID) -> bool:
+        self.classname(uid)
+        return self._note_classes[uid.data]
+
+    def resolve(self, v):
+        """Follow a UID to its object, unwrapping NSData, NSDate and NSString wrappers."""
+        if isinstance(v, plistlib.UID):
+            if not 0 < v.data < self.num_objects:  # 0 is $null
+                return None
+            v = self.plist.value(self.object_ref(v.data), depth=1)
+        if isinstance(v, dict):
+            for k in ("NS.data", "NS.bytes", "NS.string"):
+                if k in v:
+                    return self.resolve(v[k])
+            if isinstance(v.get("NS.time"), (int, float)):
+                return _NSDATE_EPOCH + dt.timedelta(seconds=v["NS.time"])
+        return v
+
+    def _roles_for(self, classname: str, keys: tuple) -> Optional[dict]:
+        """Map field roles to keys for one record shape; None if it has no RTF field."""
+        shape = (classname, keys)
+        if shape not in self._roles:
+            rtf = [k for k in keys if isinstance(k, str) and _RTF_KEY.search(k)]
+            roles = None
+            if rtf:
+                roles = {"rtf": rtf[0], "id": next((k for k in keys if _ID_KEY.search(k)), None)}
+                for role, pat in _DATE_ROLES:
+                    roles[role] = next((k for k in keys if pat.search(k)), None)
+            self._roles[shape] = roles
+        return self._roles[shape]
+
+    def records(self) -> Iterator[Tuple[int, str, dict]]:
+        """Yield (object index, class name, {role: value}) for each note record.
+
+        Notes are the records whose class is in KEYED_NOTE_CLASSES; the key names only say
+        which of their fields holds what.
+        """
+        plist, names = self.plist, self._keys
+        for idx in range(self.num_objects):
+            keys, vals = plist.children(self.object_ref(idx))
+            if not keys:
                 continue
-            cleaned_chars.append(char)
-        except UnicodeEncodeError:
+            for k in keys:
+                if k not in names:
+                    names[k] = plist.value(k)
+            fields = dict(zip((names[k] for k in keys), vals))
+            cls = plist.value(fields["$class"]) if "$class" in fields else None
+            if not isinstance(cls, plistlib.UID):
+                continue
+            classname = self.classname(cls)
+            roles = self._roles_for(classname, tuple(k for k in fields if k != "$class"))
+            if not roles:
+                continue
+            if not self.is_note_class(cls):
+                self.skipped_classes.add(classname)
+                continue
+            yield idx, classname, {
+                role: self.resolve(plist.value(fields[key]))
+                for role, key in roles.items()
+                if key is not None
+            }
+
+
+def _iter_keyed_notes(
+    archive: KeyedArchive, tz, opts: Optional[ConvertOptions]
+) -> Iterator[StickyNote]:
+    found = False
+    for idx, classname, rec in archive.records():
+        rtf = rec.get("rtf")
+        if not isinstance(rtf, (bytes, memoryview)) or not rtf:
             continue
+        found = True
+        created = _as_dt(rec.get("created"), tz) or dt.datetime.now(tz)
+        modified = _as_dt(rec.get("modified"), tz) or created
+        # An archived identifier survives reordering; the object index is the last resort
+        ident = rec.get("id")
+        source_id = f"db:{ident}" if isinstance(ident, str) and ident else f"db#{idx}"
+        yield LazyStickyNote(_as_payload(rtf), created, modified, source_id, None, "", opts)
+    if not found and archive.skipped_classes:
+        classes = ", ".join(sorted(archive.skipped_classes))
+        print(f"Warning: no known Stickies note classes in the database; skipped RTF in {classes}")
+
+
+# --- NSArchiver typedstream decoder ---
+
+# Head bytes of the typedstream encoding (signed); smaller values are reference numbers
+_TS_INT2, _TS_INT4, _TS_FLOAT, _TS_NEW, _TS_NIL, _TS_END = -127, -126, -125, -124, -123, -122
+_TS_FIRST_REF = -110
+_TS_RTF_BRACES = re.compile(rb"\\[\\{}]|[{}]")
+STICKIES_COLORS = ("Yellow", "Blue", "Green", "Pink", "Purple", "Gray")  # Color menu order
+
+
+class TypedStreamError(ValueError):
+    pass
+
 
-    return "".join(cleaned_chars)
+@dataclass
+class ArchivedObject:
+    classname: str
+    values: list  # (type encoding, value) pairs in archive order
+
+
+def _ts_split_types(enc: bytes) -> list[bytes]:
+    """Split an Objective-C type encoding such as b"i{_NSRect={_NSPoint=ff}{_NSSize=ff}}"."""
+    types, i = [], 0
+    while i < len(enc):
+        start, depth = i, 0
+        while True:
+            ch = enc[i : i + 1]
+            i += 1
+            if ch in (b"[", b"{", b"("):
+                depth += 1
+            elif ch in (b"]", b"}", b")"):
+                depth -= 1
+            if depth == 0 or i >= len(enc):
+                break
+        types.append(enc[start:i])
+    return types
 
 
-def rtf_to_html_and_text(rtf_bytes: bytes) -> Tuple[Optional[str], str]:
-    """Return (html or None, plain_text). Prefer Pandoc HTML; fallback to plain."""
-    try:
-        s = rtf_bytes.decode("utf-8", errors="ignore")
-    except Exception:
-        s = rtf_bytes.decode("latin-1", errors="ignore")
+def _ts_struct_fields(enc: bytes) -> list[bytes]:
+    body = enc[1:-1]
+    name_end = body.find(b"=")
+    return _ts_split_types(body[name_end + 1 :] if name_end >= 0 else body)
 
-    html = None
-    if HAS_PANDOC:
-        try:
-            html = pypandoc.convert_text(s, "html", format="rtf")
-            if html:
-                html = clean_unicode_text(html)
-        except Exception:
-            html = None
 
-    if html:
-        plain = BeautifulSoup(html, "html.parser").get_text("\n")
-        plain = "\n".join([ln.rstrip() for ln in plain.splitlines()])
-        plain = clean_unicode_text(plain)
-        return html, plain
+class TypedStream:
+    """Sequential decoder for NSArchiver "typedstream" archives over a memory-mapped file.
 
-    # Fallback: plain text via striprtf or crude regex strip
-    if HAS_STRIPRTF:
-        try:
-            text = rtf_to_text(s)
-        except Exception:
-            text = ""
-    else:
-        import re as _re
+    Values are read in archive order and byte arrays come back as memoryviews into the mapping,
+    so the root array can be streamed one element at a time.
+    """
 
-        text = _re.sub(r"\\'[0-9a-fA-F]{2}", " ", s)
-        text = _re.sub(r"\\[a-zA-Z]+-?\d*\s?", "", text)
-        text = _re.sub(r"[{}]", "", text)
-    text = "\n".join([ln.rstrip() for ln in text.splitlines()])
-    text = clean_unicode_text(text)
-    return None, text
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buf = memoryview(self._mm)
+        self._pos = 1  # streamer version byte
+        self._strings: list = []  # shared strings
+        self._objects: list = []  # objects and classes share one reference table
+        try:
+            signature = bytes(self._unshared())
+        except (IndexError, struct.error):
+            signature = None
+        if signature == b"streamtyped":
+            self._order = "<"
+        elif signature == b"typedstream":
+            self._order = ">"
+        else:
+            raise TypedStreamError(f"{path} is not a typedstream archive")
+        self.system_version = self._int()
+
+    def _head(self) -> int:
+        h = self._buf[self._pos]
+        self._pos += 1
+        return h - 256 if h > 127 else h
+
+    def _unpack(self, code: str):
+        v = struct.unpack_from(self._order + code, self._buf, self._pos)[0]
+        self._pos += struct.calcsize(code)
+        return v
+
+    def _int(self, head: Optional[int] = None) -> int:
+        h = self._head() if head is None else head
+        if h == _TS_INT2:
+            return self._unpack("h")
+        if h == _TS_INT4:
+            return self._unpack("i")
+        return h
+
+    def _unshared(self, head: Optional[int] = None):
+        h = self._head() if head is None else head
+        if h == _TS_NIL:
+            return None
+        n = self._int(h)
+        data = self._buf[self._pos : self._pos + n]
+        self._pos += n
+        return data
+
+    def _shared(self) -> Optional[bytes]:
+        h = self._head()
+        if h == _TS_NIL:
+            return None
+        if h == _TS_NEW:
+            self._strings.append(bytes(self._unshared()))
+            return self._strings[-1]
+        return self._strings[self._int(h) - _TS_FIRST_REF]
+
+    def _class(self) -> Optional[str]:
+        h = self._head()
+        if h == _TS_NIL:
+            return None
+        if h != _TS_NEW:
+            return self._objects[self._int(h) - _TS_FIRST_REF]
+        name = self._shared().decode("ascii", errors="replace")
+        self._int()  # class version
+        self._objects.append(name)
+        self._class()  # superclass chain, recorded for later references
+        return name
+
+    def _object(self, head: Optional[int] = None):
+        h = self._head() if head is None else head
+        if h == _TS_NIL:
+            return None
+        if h != _TS_NEW:
+            return self._objects[self._int(h) - _TS_FIRST_REF]
+        ref = len(self._objects)
+        self._objects.append(None)
+        classname = self._class()
+        values = []
+        while self._buf[self._pos] != _TS_END + 256:
+            values.extend(self._group())
+        self._pos += 1
+        self._objects[ref] = obj = self._wrap(classname, values)
+        return obj
+
+    def _group(self) -> list:
+        return [(t, self._value(t)) for t in _ts_split_types(self._shared())]
+
+    def _value(self, t: bytes):
+        code = t[:1]
+        if code in b"cCsSiIlLqQ":
+            v = self._int()
+            return v & 0xFF if code == b"C" and v < 0 else v
+        if code in (b"f", b"d"):
+            h = self._head()
+            return self._unpack(code.decode()) if h == _TS_FLOAT else float(self._int(h))
+        if code in (b"*", b"%", b":"):
+            return self._shared()
+        if code == b"+":
+            return self._unshared()
+        if code == b"#":
+            return self._class()
+        if code == b"@":
+            return self._object()
+        if code == b"[":
+            n = int(re.match(rb"\[(\d+)", t).group(1))
+            elem = t[len(str(n)) + 1 : -1]
+            if elem in (b"c", b"C"):
+                data = self._buf[self._pos : self._pos + n]
+                self._pos += n
+                return data
+            return [self._value(elem) for _ in range(n)]
+        if code == b"{":
+            return [self._value(f) for f in _ts_struct_fields(t)]
+        raise TypedStreamError(f"unsupported type encoding {t!r} at offset {self._pos}")
+
+    @staticmethod
+    def _wrap(classname: Optional[str], values: list):
+        """Turn the Foundation classes notes are built from into plain values."""
+        if classname in ("NSData", "NSMutableData"):
+            return next((v for t, v in values if t[:1] == b"["), b"")
+        if classname in ("NSDate", "NSCalendarDate"):
+            seconds = next((v for t, v in values if t in (b"d", b"f")), 0.0)
+            return _NSDATE_EPOCH + dt.timedelta(seconds=seconds)
+        if classname in ("NSString", "NSMutableString"):
+            return next((str(v, "utf-8", errors="replace") for t, v in values if t == b"+"), "")
+        if classname in ("NSArray", "NSMutableArray"):
+            return [v for t, v in values if t == b"@"]
+        return ArchivedObject(classname or "", values)
+
+    def iter_root_array(self) -> Iterator:
+        """Yield the elements of the root array as they are decoded."""
+        if self._shared() != b"@" or self._head() != _TS_NEW:
+            raise TypedStreamError("typedstream root is not an object")
+        self._objects.append(None)
+        classname = self._class()
+        if classname not in ("NSArray", "NSMutableArray"):
+            raise TypedStreamError(f"typedstream root is {classname}, not an array")
+        while self._buf[self._pos] != _TS_END + 256:
+            for t, v in self._group():
+                if t == b"@":
+                    yield v
+
+
+def rtfd_text(data):
+    """Return the TXT.rtf document out of flattened RTFD data (or RTF data as-is)."""
+    depth, start = 0, None
+    for m in _TS_RTF_BRACES.finditer(data):
+        tok = m.group()
+        if tok == b"{":
+            if start is None:
+                if data[m.start() : m.start() + 5] != b"{\\rtf":
+                    continue
+                start = m.start()
+            depth += 1
+        elif tok == b"}" and start is not None:
+            depth -= 1
+            if depth == 0:
+                return data[start : m.end()]
+    return data[start:] if start is not None else None
+
+
+def _iter_typedstream_notes(
+    stream: TypedStream, tz, opts: Optional[ConvertOptions]
+) -> Iterator[StickyNote]:
+    for idx, doc in enumerate(stream.iter_root_array()):
+        if not isinstance(doc, ArchivedObject):
+            continue
+        data, dates, color, last_int = None, [], None, None
+        for t, v in doc.values:
+            if isinstance(v, memoryview) and data is None:
+                data = v
+            elif isinstance(v, dt.datetime):
+                dates.append(v.astimezone(tz) if tz else v)
+                # Documents archive their window color as the last int ahead of the dates
+                if color is None and last_int is not None and 0 <= last_int < len(STICKIES_COLORS):
+                    color = STICKIES_COLORS[last_int]
+            elif t[:1] in (b"i", b"I", b"c", b"s"):
+                last_int = v
+        rtf = rtfd_text(data) if data is not None else None
+        if not rtf:
+            continue
+        created = dates[0] if dates else dt.datetime.now(tz)
+        modified = dates[1] if len(dates) > 1 else created
+        yield LazyStickyNote(rtf, created, modified, f"db#{idx}", color, "", opts)
 
 
 def _extract_note_candidates(obj) -> list[dict]:
-    import re as _re
-
     found = []
 
     def visit(x):
         if isinstance(x, dict):
-            rtf_keys = [k for k in x.keys() if _re.search(r"rtf|nsrtf|rtfd|textdata", k, _re.I)]
+            rtf_keys = [k for k in x.keys() if _RTF_KEY.search(k)]
             if rtf_keys:
                 found.append(x)
             for v in x.values():
@@ -261,55 +1954,85 @@ def _extract_note_candidates(obj) -> list[dict]:
     return found
 
 
+def _as_payload(v):
+    # bytes are immutable and can be shared as-is; view a bytearray rather than copying it
+    return v if isinstance(v, (bytes, memoryview)) else memoryview(v)
+
+
 def _get_bytes_from_candidate(d: dict) -> Optional[bytes]:
     for k in ["NSRTFData", "NSRTF", "RTF", "RTFD", "TextData", "Data", "NoteData"]:
         if k in d:
             v = d[k]
-            if isinstance(v, (bytes, bytearray)):
-                return bytes(v)
+            if isinstance(v, (bytes, bytearray, memoryview)):
+                return _as_payload(v)
             if isinstance(v, dict):
                 for kk in ("NS.data", "data", "bytes"):
-                    if kk in v and isinstance(v[kk], (bytes, bytearray)):
-                        return bytes(v[kk])
+                    if kk in v and isinstance(v[kk], (bytes, bytearray, memoryview)):
+                        return _as_payload(v[kk])
     return None
 
 
 def _get_dt(d: dict, hint: str, tz: Optional["ZoneInfo"]) -> Optional[dt.datetime]:
-    import re as _re
-
     for k, v in d.items():
-        if _re.search(hint, k, _re.I):
-            if isinstance(v, dt.datetime):
-                return v if v.tzinfo or not tz else v.replace(tzinfo=tz)
-            if isinstance(v, (int, float)):
-                return dt.datetime.fromtimestamp(float(v), tz=tz)
-            if isinstance(v, str):
-                try:
-                    t = dt.datetime.fromisoformat(v)
-                    return t if t.tzinfo or not tz else t.replace(tzinfo=tz)
-                except Exception:
-                    pass
+        if re.search(hint, k, re.I):
+            t = _as_dt(v, tz)
+            if t:
+                return t
+    return None
+
+
+def _as_dt(v, tz: Optional["ZoneInfo"]) -> Optional[dt.datetime]:
+    """Aware datetimes are converted to tz; naive ones are taken to be in it already."""
+    if isinstance(v, dt.datetime):
+        if v.tzinfo:
+            return v.astimezone(tz) if tz else v
+        return v.replace(tzinfo=tz) if tz else v
+    if isinstance(v, (int, float)) and not isinstance(v, bool):
+        return dt.datetime.fromtimestamp(float(v), tz=tz)
+    if isinstance(v, str):
+        try:
+            return _as_dt(dt.datetime.fromisoformat(v), tz)
+        except Exception:
+            pass
     return None
 
 
-def read_stickies_db(db_path: Path, tz_str: str) -> list[StickyNote]:
+def read_stickies_db(
+    db_path: Path, tz_str: str, opts: Optional[ConvertOptions] = None
+) -> Iterator[StickyNote]:
+    """Open the database and return an iterator over its notes (converted lazily).
+
+    Binary plists are streamed from a memory map, and keyed archives among them are decoded by
+    class. Legacy NSArchiver databases are streamed by the typedstream decoder; other formats
+    are loaded with plistlib.
+    """
     tz = ZoneInfo(tz_str) if ZoneInfo else None
+    # Opened eagerly so a locked or unreadable DB fails here rather than mid-stream
     with open(db_path, "rb") as f:
+        head = f.read(13)
+        if head[2:] in (b"streamtyped", b"typedstream"):
+            return _iter_typedstream_notes(TypedStream(db_path), tz, opts)
+        if head[:8] == b"bplist00":
+            plist = BinaryPlist(db_path)
+            archive = KeyedArchive.open(plist)
+            if archive:
+                return _iter_keyed_notes(archive, tz, opts)
+            return _iter_db_notes(_iter_bplist_candidates(plist), tz, opts)
+        f.seek(0)
         data = plistlib.load(f)
-    notes: list[StickyNote] = []
-    for idx, cand in enumerate(_extract_note_candidates(data)):
+    return _iter_db_notes(_extract_note_candidates(data), tz, opts)
+
+
+def _iter_db_notes(
+    candidates: Iterable[dict], tz, opts: Optional[ConvertOptions]
+) -> Iterator[StickyNote]:
+    for idx, cand in enumerate(candidates):
         rtf = _get_bytes_from_candidate(cand)
         if not rtf:
             continue
-        html, plain = rtf_to_html_and_text(rtf)
         created = _get_dt(cand, r"create|birth", tz) or dt.datetime.now(tz)
         modified = _get_dt(cand, r"modif|update", tz) or created
-        title = truncate_title(first_nonempty_line(plain))
-        title = clean_unicode_text(title)
-        plain = clean_unicode_text(plain) if plain else ""
-        html = clean_unicode_text(html) if html else None
-        notes.append(StickyNote(title, created, modified, html, plain, f"db#{idx}", None))
-    return notes
+        yield LazyStickyNote(rtf, created, modified, f"db#{idx}", None, "", opts)
 
 
 def rgb_to_color_name(red: float, green: float, blue: float) -> str:
@@ -362,87 +2085,433 @@ def load_sticky_colors(stickies_dir: Path) -> dict[str, str]:
 
     try:
         with open(state_file, "rb") as f:
-            state_data = plistlib.load(f)
-
-        if isinstance(state_data, list):
-            for sticky_data in state_data:
-                if isinstance(sticky_data, dict):
-                    # Try to find the sticky ID and color
-                    sticky_id = None
-                    color = None
-
-                    # Look for ID in various possible keys
-                    for key in ["UUID", "ID", "Identifier"]:
-                        if key in sticky_data:
-                            sticky_id = sticky_data[key]
-                            break
-
-                    # Look for color information
-                    if "StickyColor" in sticky_data and isinstance(
-                        sticky_data["StickyColor"], dict
-                    ):
-                        color_dict = sticky_data["StickyColor"]
-                        if all(k in color_dict for k in ["Red", "Green", "Blue"]):
-                            color = rgb_to_color_name(
-                                color_dict["Red"], color_dict["Green"], color_dict["Blue"]
-                            )
-
-                    if sticky_id and color:
-                        color_map[sticky_id] = color
-
+            color_map = parse_sticky_colors(plistlib.load(f))
     except Exception as e:
         print(f"Warning: Could not load sticky colors: {e}")
 
     return color_map
 
 
-def read_rtf_dir(folder: Path, tz_str: str) -> list[StickyNote]:
+def parse_sticky_colors(state_data) -> dict[str, str]:
+    """Map sticky UUIDs to color names from loaded .SavedStickiesState data."""
+    color_map = {}
+    if isinstance(state_data, list):
+        for sticky_data in state_data:
+            if isinstance(sticky_data, dict):
+                # Try to find the sticky ID and color
+                sticky_id = None
+                color = None
+
+                # Look for ID in various possible keys
+                for key in ["UUID", "ID", "Identifier"]:
+                    if key in sticky_data:
+                        sticky_id = sticky_data[key]
+                        break
+
+                # Look for color information
+                if "StickyColor" in sticky_data and isinstance(sticky_data["StickyColor"], dict):
+                    color_dict = sticky_data["StickyColor"]
+                    if all(k in color_dict for k in ["Red", "Green", "Blue"]):
+                        color = rgb_to_color_name(
+                            color_dict["Red"], color_dict["Green"], color_dict["Blue"]
+                        )
+
+                if sticky_id and color:
+                    color_map[sticky_id] = color
+
+    return color_map
+
+
+class SourceManifest:
+    """Records what each source file looked like when it was last imported into a database,
+    so unchanged files can be skipped on the next run without reading them."""
+
+    def __init__(
+        self, path: Path, database_id: str, skip_unchanged: bool = True, read_only: bool = False
+    ):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.database_id = database_id
+        self.skip_unchanged = skip_unchanged
+        self.read_only = read_only  # --dry-run skips as usual but records nothing
+        self.db = sqlite3.connect(str(path))
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS sources ("
+            "database_id TEXT NOT NULL, path TEXT NOT NULL, inode INTEGER, size INTEGER, "
+            "mtime_ns INTEGER, content_hash TEXT, import_hash TEXT, imported_at REAL, "
+            "PRIMARY KEY (database_id, path))"
+        )
+        self.known: dict[str, tuple] = {
+            row[0]: row[1:]
+            for row in self.db.execute(
+                "SELECT path, inode, size, mtime_ns, content_hash FROM sources WHERE database_id = ?",
+                (database_id,),
+            )
+        }
+        self.skipped = 0
+        self.recorded = 0
+
+    @staticmethod
+    def fingerprint(st: os.stat_result) -> tuple:
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def unchanged_stat(self, path: str, fingerprint: tuple) -> bool:
+        row = self.known.get(path)
+        return self.skip_unchanged and row is not None and row[:3] == fingerprint
+
+    def unchanged_content(self, path: str, content_hash: str) -> bool:
+        row = self.known.get(path)
+        return self.skip_unchanged and row is not None and row[3] == content_hash
+
+    def record(self, path: str, fingerprint: tuple, content_hash: str, import_hash: Optional[str]):
+        if self.read_only:
+            return
+        if import_hash is None:
+            # Same content under a new inode/mtime (e.g. touched): keep the earlier Import Hash
+            self.db.execute(
+                "UPDATE sources SET inode = ?, size = ?, mtime_ns = ? "
+                "WHERE database_id = ? AND path = ?",
+                (*fingerprint, self.database_id, path),
+            )
+        else:
+            self.db.execute(
+                "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.database_id, path, *fingerprint, content_hash, import_hash, time.time()),
+            )
+            self.recorded += 1
+        self.known[path] = (*fingerprint, content_hash)
+
+    def commit(self):
+        self.db.commit()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+
+def scan_rtf_dir(folder: Path) -> list[os.DirEntry]:
+    """List the .rtf files and .rtfd bundles in folder, sorted by name, with one directory read.
+
+    DirEntry caches its stat result, so callers pay at most one stat per entry, and only
+    when they ask for it.
+    """
+    try:
+        with os.scandir(folder) as it:
+            entries = [
+                e for e in it if not e.name.startswith(".") and e.name.endswith((".rtf", ".rtfd"))
+            ]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    entries.sort(key=lambda e: e.name)
+    return entries
+
+
+def read_rtf_dir(
+    folder: Path,
+    tz_str: str,
+    opts: Optional[ConvertOptions] = None,
+    entries: Optional[list[os.DirEntry]] = None,
+    manifest: Optional[SourceManifest] = None,
+    io_threads: int = 0,
+    read_ahead: int = 32,
+) -> Iterator[StickyNote]:
+    """Return an iterator that reads one note file at a time (converted lazily).
+
+    Pass entries from an earlier scan_rtf_dir(folder) to avoid listing the folder twice.
+    With a manifest, files unchanged since they were last imported are skipped. With
+    io_threads, up to read_ahead files are stat'ed and read in the background.
+    """
     tz = ZoneInfo(tz_str) if ZoneInfo else None
-    notes: list[StickyNote] = []
-    if not folder.exists():
-        return notes
+    if entries is None:
+        entries = scan_rtf_dir(folder)
+    if not entries:
+        return iter(())
 
     # Load color information
     color_map = load_sticky_colors(folder)
+    return _iter_rtf_dir(entries, tz, color_map, opts, manifest, io_threads, read_ahead)
 
-    for p in sorted(list(folder.glob("*.rtf")) + list(folder.glob("*.rtfd"))):
-        try:
-            if p.suffix.lower() == ".rtf":
-                # Single RTF file
-                raw = p.read_bytes()
-            elif p.suffix.lower() == ".rtfd":
-                # RTF bundle - read TXT.rtf inside
-                rtf_file = p / "TXT.rtf"
-                if rtf_file.exists():
-                    raw = rtf_file.read_bytes()
-                else:
-                    continue
-            else:
-                continue
-        except Exception:
-            continue
-        html, plain = rtf_to_html_and_text(raw)
+
+io_stats = {"files": 0, "read_seconds": 0.0, "wait_seconds": 0.0}
+
+
+def prefetch(fn, items: Iterable, threads: int, depth: int) -> Iterator:
+    """Yield fn(item) for each item in order, running up to depth calls ahead on threads."""
+    if threads <= 0:
+        for item in items:
+            yield fn(item)
+        return
+    it = iter(items)
+    with ThreadPoolExecutor(max_workers=threads) as ex:
+        pending = collections.deque(ex.submit(fn, x) for x in itertools.islice(it, max(depth, 1)))
+        while pending:
+            fut = pending.popleft()
+            t0 = time.perf_counter()
+            result = fut.result()
+            io_stats["wait_seconds"] += time.perf_counter() - t0
+            for x in itertools.islice(it, 1):
+                pending.append(ex.submit(fn, x))
+            yield result
+
+
+MMAP_THRESHOLD = 1 << 20  # Files at least this large are memory-mapped instead of read
+
+
+def read_payload(path: Path):
+    """Return a file's bytes, memory-mapping large files so they are never copied onto the heap.
+
+    Large files come back as a read-only memoryview over the mapping. The re, hashlib and
+    str() decoding used by the converters all accept it directly.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            return f.read()
+        # The mapping stays valid after the file is closed and is unmapped with the view
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def _load_rtf_entry(entry: os.DirEntry, manifest: Optional[SourceManifest]) -> Optional[tuple]:
+    """Stat and read one .rtf file or .rtfd bundle; safe to run on prefetch threads.
+
+    Returns None if unreadable, ("unchanged", None, ...) if the manifest says so, otherwise
+    ("ok", raw, stat, fingerprint, content_hash, seconds).
+    """
+    t0 = time.perf_counter()
+    p = Path(entry.path)
+    fingerprint = None
+    try:
+        if manifest is not None:
+            # A bundle's own stat doesn't change when TXT.rtf is edited in place
+            rtf_st = entry.stat() if entry.name.endswith(".rtf") else os.stat(p / "TXT.rtf")
+            fingerprint = manifest.fingerprint(rtf_st)
+            if manifest.unchanged_stat(entry.path, fingerprint):
+                return ("unchanged", None, None, fingerprint, None, time.perf_counter() - t0)
+        if entry.name.endswith(".rtf"):
+            # Single RTF file
+            raw = read_payload(p)
+        else:
+            # RTF bundle - read TXT.rtf inside (a missing one raises and is skipped)
+            raw = read_payload(p / "TXT.rtf")
         # Use file timestamps since per-file metadata varies
-        st = p.stat()
+        st = entry.stat()
+    except Exception:
+        return None
+    content_hash = hashlib.sha256(raw).hexdigest() if manifest is not None else None
+    return ("ok", raw, st, fingerprint, content_hash, time.perf_counter() - t0)
+
+
+def _iter_rtf_dir(
+    entries: list[os.DirEntry],
+    tz,
+    color_map: dict[str, str],
+    opts: Optional[ConvertOptions],
+    manifest: Optional[SourceManifest] = None,
+    io_threads: int = 0,
+    read_ahead: int = 32,
+) -> Iterator[StickyNote]:
+    loaded = prefetch(lambda e: _load_rtf_entry(e, manifest), entries, io_threads, read_ahead)
+    for entry, res in zip(entries, loaded):
+        if res is None:
+            continue
+        status, raw, st, fingerprint, content_hash, seconds = res
+        io_stats["files"] += 1
+        io_stats["read_seconds"] += seconds
+        if status == "unchanged":
+            manifest.skipped += 1
+            continue
+        if manifest is not None and manifest.unchanged_content(entry.path, content_hash):
+            manifest.record(entry.path, fingerprint, content_hash, None)
+            manifest.skipped += 1
+            continue
+
+        p = Path(entry.path)
         created = dt.datetime.fromtimestamp(getattr(st, "st_birthtime", st.st_mtime), tz=tz)
         modified = dt.datetime.fromtimestamp(st.st_mtime, tz=tz)
-        title = truncate_title(first_nonempty_line(plain) or p.stem)
-        title = clean_unicode_text(title)
-        plain = clean_unicode_text(plain) if plain else ""
-        html = clean_unicode_text(html) if html else None
 
         # Extract UUID from filename for color lookup
         sticky_uuid = p.stem  # e.g., "0832F37A-A9C7-46DD-8E34-C549AEE4F395"
         color = color_map.get(sticky_uuid)
 
-        notes.append(StickyNote(title, created, modified, html, plain, str(p), color))
-    return notes
+        note = LazyStickyNote(raw, created, modified, str(p), color, p.stem, opts)
+        if manifest is not None:
+            note.source_state = (fingerprint, content_hash)
+        yield note
+
+
+# --- Archive source ---
+
+STATE_FILE = ".SavedStickiesState"
+TAR_COLOR_LOOKAHEAD = 64  # notes held back for a state file stored later in a tar
+
+
+def _archive_note_path(name: str) -> Optional[str]:
+    """Return the .rtf file or .rtfd bundle an archive member holds the text of, if any."""
+    parts = name.split("/")
+    if len(parts) > 1 and parts[-1] == "TXT.rtf" and parts[-2].endswith(".rtfd"):
+        parts = parts[:-1]
+    elif not parts[-1].endswith(".rtf") or any(p.endswith(".rtfd") for p in parts):
+        return None
+    # Skip hidden files and the AppleDouble copies macOS adds to zips
+    if parts[-1].startswith(".") or parts[0] == "__MACOSX":
+        return None
+    return "/".join(parts)
+
+
+def _member_name(name: str) -> str:
+    name = name.rstrip("/")
+    return name[2:] if name.startswith("./") else name
+
+
+def _is_state_file(name: str) -> bool:
+    return name.rsplit("/", 1)[-1] == STATE_FILE and not name.startswith("__MACOSX/")
+
+
+def _zip_mtime(info: zipfile.ZipInfo, tz) -> dt.datetime:
+    """Member mtime, from the extended timestamp field when present (DOS times are local, 2 s)."""
+    extra = info.extra
+    i = 0
+    while i + 4 <= len(extra):
+        tag, size = struct.unpack_from("<HH", extra, i)
+        if tag == 0x5455 and size >= 5 and extra[i + 4] & 1:
+            return dt.datetime.fromtimestamp(struct.unpack_from("<i", extra, i + 5)[0], tz=tz)
+        i += 4 + size
+    return dt.datetime(*info.date_time, tzinfo=tz)
+
+
+def read_archive(
+    path: Path, tz_str: str, opts: Optional[ConvertOptions] = None
+) -> Iterator[StickyNote]:
+    """Return an iterator over the notes in a zip or tar backup of a Stickies folder.
+
+    Members are streamed straight out of the archive, nothing is written to disk, and
+    timestamps come from the member metadata.
+    """
+    tz = ZoneInfo(tz_str) if ZoneInfo else None
+    # Opened eagerly so a missing or corrupt archive fails here rather than mid-stream
+    if zipfile.is_zipfile(path):
+        return _iter_zip_notes(zipfile.ZipFile(path), path, tz, opts)
+    if tarfile.is_tarfile(path):
+        return _iter_tar_notes(path, tz, opts)
+    raise ValueError("not a zip or tar archive")
+
+
+def _iter_zip_notes(zf: zipfile.ZipFile, path: Path, tz, opts) -> Iterator[StickyNote]:
+    with zf:
+        infos = {_member_name(i.filename): i for i in zf.infolist()}
+        color_map = {}
+        for name, info in infos.items():
+            if _is_state_file(name):
+                color_map.update(_archive_sticky_colors(zf.read(info)))
+        for name in sorted(infos):
+            note = _archive_note_path(name)
+            if not note or infos[name].is_dir():
+                continue
+            t0 = time.perf_counter()
+            raw = zf.read(infos[name])
+            io_stats["files"] += 1
+            io_stats["read_seconds"] += time.perf_counter() - t0
+            modified = _zip_mtime(infos[name], tz)
+            # A bundle's directory entry is usually older than its TXT.rtf
+            created = min(modified, _zip_mtime(infos.get(note, infos[name]), tz))
+            yield _archive_note(raw, created, modified, path, note, color_map, opts)
+
+
+def _iter_tar_notes(path: Path, tz, opts) -> Iterator[StickyNote]:
+    # Notes met before the state file wait (up to TAR_COLOR_LOOKAHEAD) for its colors; past
+    # that, a second pass that stops at the state file fetches them
+    color_map = {}
+    pending = []  # (raw, created, modified, note) not yet yielded
+    colors_found = looked_ahead = False
+    colorless = 0
+    bundles = {}  # .rtfd directory member -> its creation time
+    with tarfile.open(path, "r|*") as tf:
+        for m in tf:
+            name = _member_name(m.name)
+            if m.isdir():
+                if name.endswith(".rtfd"):
+                    bundles[name] = _tar_created(m, tz)
+                continue
+            if m.isfile() and _is_state_file(name):
+                if not colors_found:
+                    color_map.update(_archive_sticky_colors(tf.extractfile(m).read()))
+                    colors_found = True
+                continue
+            note = _archive_note_path(name)
+            if not note or not m.isfile():
+                continue
+            t0 = time.perf_counter()
+            raw = tf.extractfile(m).read()
+            io_stats["files"] += 1
+            io_stats["read_seconds"] += time.perf_counter() - t0
+            modified = dt.datetime.fromtimestamp(m.mtime, tz=tz)
+            created = min(modified, bundles.pop(note, None) or _tar_created(m, tz))
+            pending.append((raw, created, modified, note))
+            if not colors_found and not looked_ahead:
+                if len(pending) < TAR_COLOR_LOOKAHEAD:
+                    continue
+                looked_ahead = True
+                colors = _tar_sticky_colors(path)
+                if colors is not None:
+                    color_map.update(colors)
+                    colors_found = True
+            colorless += 0 if colors_found else len(pending)
+            for raw, created, modified, note in pending:
+                yield _archive_note(raw, created, modified, path, note, color_map, opts)
+            pending.clear()
+    colorless += 0 if colors_found else len(pending)
+    for raw, created, modified, note in pending:
+        yield _archive_note(raw, created, modified, path, note, color_map, opts)
+    if colorless:
+        print(f"Warning: no {STATE_FILE} in {path}; {colorless} notes imported without colors")
+
+
+def _tar_created(m: tarfile.TarInfo, tz) -> dt.datetime:
+    # macOS tar records birth times in a pax header
+    created = m.pax_headers.get("LIBARCHIVE.creationtime")
+    return dt.datetime.fromtimestamp(float(created or m.mtime), tz=tz)
+
+
+def _tar_sticky_colors(path: Path) -> Optional[dict[str, str]]:
+    """Read the colors from a tar archive, stopping at the state file; None if it has none."""
+    with tarfile.open(path, "r|*") as tf:
+        for m in tf:
+            if m.isfile() and _is_state_file(_member_name(m.name)):
+                return _archive_sticky_colors(tf.extractfile(m).read())
+    return None
+
+
+def _archive_sticky_colors(data: bytes) -> dict[str, str]:
+    try:
+        return parse_sticky_colors(plistlib.loads(data))
+    except Exception as e:
+        print(f"Warning: Could not load sticky colors: {e}")
+        return {}
+
+
+def _archive_note(raw, created, modified, path: Path, note: str, color_map, opts) -> StickyNote:
+    stem = note.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+    return LazyStickyNote(raw, created, modified, f"{path}:{note}", color_map.get(stem), stem, opts)
 
 
 def sha256_hex(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8", errors="ignore")).hexdigest()
 
 
+def windows(it: Iterable, size: int) -> Iterator[list]:
+    """Yield lists of up to size items, pulling from it only as each list is needed."""
+    it = iter(it)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def note_hash(n: StickyNote) -> str:
+    # Stable import hash (content + created)
+    return sha256_hex(normalize_ws(n.plain) + "|" + n.created.isoformat())
+
+
 MAX_TEXT_CHUNK = 1800
 
 
@@ -460,6 +2529,90 @@ def chunk_text(s: str, n: int = MAX_TEXT_CHUNK):
     return [c for c in chunks if c]
 
 
+# --- JSONL note records ---
+
+
+def note_to_record(n: StickyNote, converted: bool = False) -> dict:
+    """Serialize a note for --extract-jsonl: its raw RTF, or its converted text and blocks.
+
+    RTF is stored as a latin-1 string so every byte survives the round trip while the
+    (almost always ASCII) RTF stays readable.
+    """
+    rec = {
+        "source_id": n.source_id,
+        "created": n.created.isoformat(),
+        "modified": n.modified.isoformat(),
+        "color": n.color,
+    }
+    if isinstance(n, LazyStickyNote) and n.raw is not None and not converted:
+        rec["rtf"] = str(n.raw, "latin-1")
+        rec["fallback_title"] = n.fallback_title
+    else:
+        rec.update(title=n.title, plain=n.plain, blocks=note_body_blocks(n))
+    return rec
+
+
+def note_from_record(rec: dict, opts: Optional[ConvertOptions] = None) -> StickyNote:
+    created = dt.datetime.fromisoformat(rec["created"])
+    modified = dt.datetime.fromisoformat(rec.get("modified") or rec["created"])
+    if "rtf" in rec:
+        return LazyStickyNote(
+            rec["rtf"].encode("latin-1"),
+            created,
+            modified,
+            rec["source_id"],
+            rec.get("color"),
+            rec.get("fallback_title", ""),
+            opts,
+        )
+    return StickyNote(
+        rec["title"],
+        created,
+        modified,
+        None,
+        rec["plain"],
+        rec["source_id"],
+        rec.get("color"),
+        rec["blocks"],
+    )
+
+
+def read_jsonl(path: str, opts: Optional[ConvertOptions] = None) -> Iterator[StickyNote]:
+    """Return an iterator over the notes in a JSONL file ('-' for stdin), one line at a time."""
+    f = sys.stdin if path == "-" else open(os.path.expanduser(path), encoding="utf-8")
+    return _iter_jsonl(f, opts)
+
+
+def _iter_jsonl(f, opts: Optional[ConvertOptions]) -> Iterator[StickyNote]:
+    with f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield note_from_record(json.loads(line), opts)
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"Warning: skipping line {lineno} of {f.name}: {type(e).__name__}: {e}")
+
+
+def write_jsonl(notes: Iterable[StickyNote], dest, converted: bool, window: int) -> int:
+    """Write notes as JSON lines to a path or an open text file (e.g. stdout), converting them
+    window by window if asked; returns the count."""
+    count = 0
+    if isinstance(dest, str):
+        f = open(os.path.expanduser(dest), "w", encoding="utf-8")
+    else:
+        f = contextlib.nullcontext(dest)
+    with f as out:
+        for chunk in windows(notes, window):
+            if converted:
+                convert_lazy_notes(chunk)
+            for n in chunk:
+                out.write(json.dumps(note_to_record(n, converted), ensure_ascii=False) + "\n")
+            out.flush()  # a reader on the other end of a pipe gets each window as it is done
+            count += len(chunk)
+    return count
+
+
 # --- Notion helper functions needed by main() ---
 
 
@@ -470,7 +2623,7 @@ def _text_obj(content: str, **ann):
         "annotations": {
             "bold": bool(ann.get("bold")),
             "italic": bool(ann.get("italic")),
-            "strikethrough": False,
+            "strikethrough": bool(ann.get("strikethrough")),
             "underline": bool(ann.get("underline")),
             "code": bool(ann.get("code")),
             "color": "default",
@@ -514,10 +2667,33 @@ def _inline_from_node(node):
     return out[:80]  # Hard limit to stay under 100
 
 
+_html_parser = "lxml" if HAS_LXML else "html.parser"
+
+
+def use_html_parser(name: str) -> str:
+    """Select the BeautifulSoup parser; 'auto' prefers lxml when it is installed."""
+    global _html_parser
+    if name == "lxml" and not HAS_LXML:
+        raise SystemExit("ERROR: --html-parser lxml requires lxml (pip install lxml).")
+    _html_parser = ("lxml" if HAS_LXML else "html.parser") if name == "auto" else name
+    return _html_parser
+
+
+def parse_html(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, _html_parser)
+
+
 def html_to_blocks(html: str):
-    from bs4 import BeautifulSoup
+    return _soup_to_blocks(parse_html(html))
+
 
-    soup = BeautifulSoup(html, "html.parser")
+def html_to_text_and_blocks(html: str) -> Tuple[str, list]:
+    """Parse once and derive both the plain text and the Notion blocks from the same tree."""
+    soup = parse_html(html)
+    return soup.get_text("\n"), _soup_to_blocks(soup)
+
+
+def _soup_to_blocks(soup):
     body = soup.body or soup
     blocks = []
     for node in body.children:
@@ -579,16 +2755,263 @@ def html_to_blocks(html: str):
     return blocks
 
 
+class TokenBucket:
+    """Token bucket allowing `rate` requests per second on average and bursts of `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.stamp = time.monotonic()
+        self.requests = 0
+        self.delayed = 0
+        self.wait_seconds = 0.0
+
+    def reserve(self) -> float:
+        """Take a token and return how long to wait before spending it.
+
+        Tokens may be taken on credit, so callers are served in the order they asked.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        self.tokens -= 1
+        self.requests += 1
+        delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if delay:
+            self.delayed += 1
+            self.wait_seconds += delay
+        return delay
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+_rate_limiter: Optional[TokenBucket] = None
+
+
+def start_rate_limiter(rate: float, burst: int) -> Optional[TokenBucket]:
+    global _rate_limiter
+    _rate_limiter = TokenBucket(rate, burst) if rate > 0 else None
+    return _rate_limiter
+
+
+RETRYABLE_STATUS = {409, 429, 500, 502, 503, 504}  # conflicts, rate limits, server errors
+MAX_RETRY_DELAY = 60.0
+
+
+def is_retryable(e: Exception, idempotent: bool = True) -> bool:
+    """Transient failures worth retrying; anything else (bad request, auth, ...) is fatal.
+
+    After a timeout, dropped connection, conflict or 5xx the write may already have been
+    applied, so non-idempotent calls (creating pages, appending blocks) are retried only on
+    429, which Notion sends before doing anything.
+    """
+    if isinstance(e, HTTPResponseError):
+        return e.status == 429 if not idempotent else e.status in RETRYABLE_STATUS
+    return idempotent and isinstance(e, (RequestTimeoutError, httpx.TransportError))
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, never shorter than a server's Retry-After."""
+
+    def __init__(self, retries: int = 5, backoff: float = 1.0):
+        self.retries = retries
+        self.backoff = backoff
+        self.counts: collections.Counter = collections.Counter()  # reason -> retries
+        self.backoff_seconds = 0.0
+        self.gave_up = 0
+        self.fatal = 0
+
+    def delay(self, e: Exception, attempt: int, idempotent: bool = True) -> Optional[float]:
+        """Seconds to wait before retry number attempt + 1, or None to give up and re-raise."""
+        if not is_retryable(e, idempotent):
+            self.fatal += 1
+            return None
+        if attempt >= self.retries:
+            self.gave_up += 1
+            return None
+        delay = random.uniform(0, min(MAX_RETRY_DELAY, self.backoff * 2**attempt))
+        retry_after = _retry_after(e)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        self.counts[str(e.status) if isinstance(e, HTTPResponseError) else type(e).__name__] += 1
+        self.backoff_seconds += delay
+        return delay
+
+
+def _retry_after(e: Exception) -> Optional[float]:
+    headers = getattr(e, "headers", None)
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (AttributeError, TypeError, ValueError):
+        return None  # absent, or an HTTP date, which Notion doesn't send
+
+
+_retry_policy = RetryPolicy()
+
+
+def configure_retries(retries: int, backoff: float) -> RetryPolicy:
+    global _retry_policy
+    _retry_policy = RetryPolicy(retries, backoff)
+    return _retry_policy
+
+
+LATENCY_TOLERANCE = 2.0  # Back off once median latency reaches this multiple of the best seen
+
+
+def is_congestion(e: Optional[Exception]) -> bool:
+    """Responses that mean Notion wants fewer requests: rate limits, 5xx and timeouts."""
+    if isinstance(e, HTTPResponseError):
+        return e.status == 429 or e.status >= 500
+    return isinstance(e, RequestTimeoutError)
+
+
+class AIMDController:
+    """Additive-increase/multiplicative-decrease limit on in-flight async Notion requests.
+
+    After every `limit` completed requests the limit is halved if any of them hit congestion
+    or their median latency drifted past LATENCY_TOLERANCE x the best median seen, and
+    raised by one otherwise. It stays within [floor, ceiling].
+    """
+
+    def __init__(self, floor: int, ceiling: int, verbose: bool = False):
+        self.floor = max(1, floor)
+        self.ceiling = max(self.floor, ceiling)
+        self.limit = self.floor
+        self.inflight = 0
+        self.verbose = verbose
+        self.baseline: Optional[float] = None
+        self.increases = 0
+        self.decreases = 0
+        self.peak = self.limit
+        self._samples: list[Tuple[float, bool]] = []
+        self._waiters: collections.deque = collections.deque()
+
+    async def acquire(self):
+        while self.inflight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+        self.inflight += 1
+
+    def release(self, latency: float, congested: bool):
+        self.inflight -= 1
+        self._samples.append((latency, congested))
+        if len(self._samples) >= self.limit:
+            self._adjust()
+        free = self.limit - self.inflight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def _adjust(self):
+        samples, self._samples = self._samples, []
+        congested = sum(c for _, c in samples)
+        # Rejections come back fast, so only successful requests say anything about latency
+        latencies = sorted(lat for lat, c in samples if not c)
+        median = latencies[len(latencies) // 2] if latencies else 0.0
+        if latencies:
+            self.baseline = median if self.baseline is None else min(self.baseline, median)
+        old = self.limit
+        if congested or (latencies and median > LATENCY_TOLERANCE * self.baseline):
+            self.limit = max(self.floor, self.limit // 2)
+        else:
+            self.limit = min(self.ceiling, self.limit + 1)
+        if self.limit == old:
+            return
+        if self.limit > old:
+            self.increases += 1
+        else:
+            self.decreases += 1
+        self.peak = max(self.peak, self.limit)
+        if self.verbose:
+            print(
+                f"AIMD: {old} -> {self.limit} requests in flight "
+                f"({congested}/{len(samples)} throttled or 5xx, median {median:.2f}s, "
+                f"best {self.baseline or 0.0:.2f}s)"
+            )
+
+
+_concurrency_controller: Optional[AIMDController] = None
+
+
+def start_concurrency_controller(floor: int, ceiling: int, verbose: bool = False) -> AIMDController:
+    global _concurrency_controller
+    _concurrency_controller = AIMDController(floor, ceiling, verbose)
+    return _concurrency_controller
+
+
+def notion_call(fn, idempotent: bool = True, **kwargs):
+    """Make one Notion API request through the rate limiter, retrying transient failures.
+
+    Pass idempotent=False for writes that must not be repeated if they may have landed.
+    """
+    attempt = 0
+    while True:
+        if _rate_limiter is not None:
+            _rate_limiter.acquire()
+        try:
+            return fn(**kwargs)
+        except Exception as e:
+            delay = _retry_policy.delay(e, attempt, idempotent)
+            if delay is None:
+                raise
+        attempt += 1
+        time.sleep(delay)
+
+
+async def notion_call_async(fn, idempotent: bool = True, **kwargs):
+    """notion_call for AsyncClient; with --adaptive each attempt also holds an AIMD slot."""
+    ctl = _concurrency_controller
+    attempt = 0
+    while True:
+        if ctl is not None:
+            await ctl.acquire()
+        if _rate_limiter is not None:
+            await _rate_limiter.acquire_async()
+        t0 = time.monotonic()
+        error = None
+        try:
+            return await fn(**kwargs)
+        except Exception as e:
+            error = e
+            delay = _retry_policy.delay(e, attempt, idempotent)
+            if delay is None:
+                raise
+        finally:
+            if ctl is not None:
+                ctl.release(time.monotonic() - t0, is_congestion(error))
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+def describe_error(e: Exception) -> str:
+    if isinstance(e, HTTPResponseError):
+        return f"{e.status} {getattr(e, 'code', '')}: {e}"
+    return f"{type(e).__name__}: {e}"
+
+
 def fetch_existing_hashes(notion: Client, database_id: str) -> dict[str, str]:
     hashes: dict[str, str] = {}
     cursor = None
     while True:
-        resp = notion.databases.query(
+        resp = notion_call(
+            notion.databases.query,
             **(
                 {"database_id": database_id, "start_cursor": cursor}
                 if cursor
                 else {"database_id": database_id}
-            )
+            ),
         )
         for page in resp.get("results", []):
             props = page.get("properties", {})
@@ -605,14 +3028,8 @@ def fetch_existing_hashes(notion: Client, database_id: str) -> dict[str, str]:
     return hashes
 
 
-def create_or_update_page(
-    notion: Client,
-    database_id: str,
-    note,
-    page_id: str | None,
-    content_hash: str,
-    verbose: bool = False,
-):
+def page_payload(note, content_hash: str) -> Tuple[dict, list]:
+    """Build the page properties and body blocks for a note."""
     props = {
         "Name": {"title": [{"type": "text", "text": {"content": note.title}}]},
         "Created": {"date": {"start": note.created.isoformat()}},
@@ -623,7 +3040,14 @@ def create_or_update_page(
     # Add color if available
     if note.color:
         props["Color"] = {"rich_text": [{"type": "text", "text": {"content": note.color}}]}
-    if note.html:
+    return props, note_body_blocks(note)
+
+
+def note_body_blocks(note) -> list:
+    """The page body: prebuilt blocks, else blocks from the HTML, else plain-text paragraphs."""
+    if note.blocks:
+        children = note.blocks
+    elif note.html:
         children = html_to_blocks(note.html)
     else:
         # Split long plain text into multiple paragraphs
@@ -648,41 +3072,220 @@ def create_or_update_page(
                         "paragraph": {"rich_text": [{"type": "text", "text": {"content": chunk}}]},
                     }
                 )
+    return children
+
+
+APPEND_BATCH = 80  # Blocks per blocks.children.append call
+
+
+def create_or_update_page(
+    notion: Client,
+    database_id: str,
+    note,
+    page_id: str | None,
+    content_hash: str,
+    verbose: bool = False,
+):
+    props, children = page_payload(note, content_hash)
     try:
         if page_id:
             if verbose:
                 print(f"Updating page {page_id}: {note.title}")
-            notion.pages.update(page_id=page_id, properties=props)
+            notion_call(notion.pages.update, page_id=page_id, properties=props)
             # Append a divider and new content (simple, safe approach)
-            notion.blocks.children.append(
-                block_id=page_id, children=[{"object": "block", "type": "divider", "divider": {}}]
+            notion_call(
+                notion.blocks.children.append,
+                idempotent=False,
+                block_id=page_id,
+                children=[{"object": "block", "type": "divider", "divider": {}}],
+            )
+            for i in range(0, len(children), APPEND_BATCH):
+                notion_call(
+                    notion.blocks.children.append,
+                    idempotent=False,
+                    block_id=page_id,
+                    children=children[i : i + APPEND_BATCH],
+                )
+        else:
+            if verbose:
+                print(f"Creating page: {note.title}")
+            notion_call(
+                notion.pages.create,
+                idempotent=False,
+                parent={"database_id": database_id},
+                properties=props,
+                children=children,
+            )
+    except Exception as e:
+        print(f"ERROR: Notion API failed for {note.source_id}: {describe_error(e)}")
+        return False
+    return True
+
+
+async def create_or_update_page_async(
+    notion: AsyncClient,
+    database_id: str,
+    note,
+    page_id: str | None,
+    content_hash: str,
+    verbose: bool = False,
+):
+    """create_or_update_page for AsyncClient; same calls, same order, same output."""
+    props, children = page_payload(note, content_hash)
+    try:
+        if page_id:
+            if verbose:
+                print(f"Updating page {page_id}: {note.title}")
+            await notion_call_async(notion.pages.update, page_id=page_id, properties=props)
+            await notion_call_async(
+                notion.blocks.children.append,
+                idempotent=False,
+                block_id=page_id,
+                children=[{"object": "block", "type": "divider", "divider": {}}],
             )
-            BATCH = 80
-            for i in range(0, len(children), BATCH):
-                notion.blocks.children.append(block_id=page_id, children=children[i : i + BATCH])
+            for i in range(0, len(children), APPEND_BATCH):
+                await notion_call_async(
+                    notion.blocks.children.append,
+                    idempotent=False,
+                    block_id=page_id,
+                    children=children[i : i + APPEND_BATCH],
+                )
         else:
             if verbose:
                 print(f"Creating page: {note.title}")
-            notion.pages.create(
-                parent={"database_id": database_id}, properties=props, children=children
+            await notion_call_async(
+                notion.pages.create,
+                idempotent=False,
+                parent={"database_id": database_id},
+                properties=props,
+                children=children,
             )
     except Exception as e:
-        print(f"ERROR: Notion API failed: {e}")
+        print(f"ERROR: Notion API failed for {note.source_id}: {describe_error(e)}")
+        return False
+    return True
+
+
+class AsyncUploader:
+    """Uploads windows of notes with up to `concurrency` page operations in flight.
+
+    Owns a private event loop and AsyncClient that live across windows. Operations on the same
+    page are serialized, so its appends land in the order they were issued.
+    """
+
+    def __init__(self, auth: str, concurrency: int):
+        self.loop = asyncio.new_event_loop()
+        self.notion = AsyncClient(auth=auth)
+        self.concurrency = concurrency
+        self._page_locks: dict[str, asyncio.Lock] = {}
+
+    def upload(self, database_id: str, jobs: list, verbose: bool = False) -> list[bool]:
+        """Upload (note, page_id, content_hash) jobs; results come back in job order."""
+        return self.loop.run_until_complete(self._upload(database_id, jobs, verbose))
+
+    async def _upload(self, database_id: str, jobs: list, verbose: bool) -> list[bool]:
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def send(note, page_id, content_hash):
+            async with slots:
+                return await create_or_update_page_async(
+                    self.notion, database_id, note, page_id, content_hash, verbose
+                )
+
+        async def one(note, page_id, content_hash):
+            if not page_id:
+                return await send(note, page_id, content_hash)
+            # Wait for the page's turn before taking a slot, so waiting never holds one
+            async with self._page_locks.setdefault(page_id, asyncio.Lock()):
+                return await send(note, page_id, content_hash)
+
+        return await asyncio.gather(*(one(*job) for job in jobs))
+
+    def close(self):
+        self.loop.run_until_complete(self.notion.aclose())
+        self.loop.close()
+
+
+def print_conversion_stats(verbose: bool):
+    if not verbose:
+        return
+    if io_stats["files"]:
+        print(
+            f"Source reads: {io_stats['files']} files, {io_stats['read_seconds']:.2f}s reading, "
+            f"{io_stats['wait_seconds']:.2f}s waiting on I/O; "
+            f"{time.process_time():.2f}s CPU in the main process"
+        )
+    if conversion_stats:
+        print(
+            "Conversions by route: "
+            + ", ".join(f"{k}={v}" for k, v in sorted(conversion_stats.items()))
+        )
+    if _conversion_cache is not None:
+        c = _conversion_cache
+        print(
+            f"Conversion cache: {c.hits} hits, {c.misses} misses, {c.evictions} evicted ({c.path})"
+        )
+    if triage_stats:
+        print("Triage (notes, conversion time):")
+        for kind in ("plain", "simple", "complex"):
+            count, secs = triage_stats.get(kind, (0, 0.0))
+            print(f"  {kind}: {count} notes, {secs:.2f}s")
+    if batch_stats["batches"]:
+        print(
+            f"pandoc batches: {batch_stats['batches']} ({batch_stats['notes']} notes), "
+            f"{batch_stats['fallbacks']} fell back to per-note conversion"
+        )
+    if _pandoc_pool is not None:
+        print("pandoc worker throughput:")
+        for line in _pandoc_pool.report():
+            print(line)
+    p = _retry_policy
+    if p.counts or p.gave_up or p.fatal:
+        reasons = ", ".join(f"{k}={v}" for k, v in sorted(p.counts.items()))
+        print(
+            f"Notion retries: {sum(p.counts.values())} ({reasons or 'none'}), "
+            f"{p.backoff_seconds:.2f}s backing off; {p.gave_up} requests gave up after "
+            f"{p.retries} retries, {p.fatal} failed with non-retryable errors"
+        )
+    if _concurrency_controller is not None:
+        c = _concurrency_controller
+        print(
+            f"Adaptive concurrency: {c.floor}-{c.ceiling} allowed, peaked at {c.peak}, "
+            f"ended at {c.limit} ({c.increases} increases, {c.decreases} decreases)"
+        )
+    if _rate_limiter is not None and _rate_limiter.requests:
+        r = _rate_limiter
+        print(
+            f"Notion rate limit: {r.requests} requests at {r.rate:g}/s (burst {r.burst}), "
+            f"{r.delayed} delayed, {r.wait_seconds:.2f}s total waiting for tokens"
+        )
 
 
 def main():
     args = parser.parse_args()
+    jsonl_out = sys.stdout
+    if args.extract_jsonl == "-":
+        # The notes go to stdout, so every message goes to stderr to keep the JSON lines clean
+        sys.stdout = sys.stderr
+    # Extraction never talks to Notion, so it runs on machines without credentials
+    if not args.extract_jsonl:
+        if not token:
+            raise SystemExit("ERROR: NOTION_TOKEN is not set (see .env.example).")
+        if not database_id:
+            raise SystemExit("ERROR: NOTION_DB_ID is not set (see .env.example).")
     notion = Client(auth=token)
 
     if args.verbose:
-        print(f"Using database ID: {database_id}")
+        if not args.extract_jsonl:
+            print(f"Using database ID: {database_id}")
         print(f"Using TZ: {args.tz}")
 
-    db = notion.databases.retrieve(database_id=database_id)  # connectivity check
-    if args.verbose:
-        title = "".join([t.get("plain_text", "") for t in db.get("title", [])]) or "(untitled)"
-        print(f"Connected to Notion DB: {title} ({database_id})")
-        print(f"Using TZ: {args.tz}")
+    if not args.extract_jsonl:
+        db = notion.databases.retrieve(database_id=database_id)  # connectivity check
+        if args.verbose:
+            title = "".join([t.get("plain_text", "") for t in db.get("title", [])]) or "(untitled)"
+            print(f"Connected to Notion DB: {title} ({database_id})")
+            print(f"Using TZ: {args.tz}")
 
     if args.show_db_path:
         db_path = Path(os.path.expanduser(args.db_path))
@@ -695,12 +3298,12 @@ def main():
             print(f"\nRTF directory: {rtf_dir}")
             print(f"RTF dir exists: {rtf_dir.exists()}")
             if rtf_dir.exists():
-                rtf_files = list(rtf_dir.glob("*.rtf")) + list(rtf_dir.glob("*.rtfd"))
+                rtf_files = scan_rtf_dir(rtf_dir)
                 print(f"RTF files found: {len(rtf_files)}")
                 if rtf_files:
                     print("→ Will use RTF mode automatically")
                     print("Sample files:")
-                    for f in sorted(rtf_files)[:5]:
+                    for f in rtf_files[:5]:
                         print(f"  - {f.name}")
                     if len(rtf_files) > 5:
                         print(f"  ... and {len(rtf_files) - 5} more")
@@ -712,19 +3315,76 @@ def main():
             print("→ Will use DB mode")
         return
 
+    if args.pandoc_workers > 0 and args.jobs > 1:
+        raise SystemExit(
+            "ERROR: --pandoc-workers can't be combined with --jobs; worker processes run their "
+            "own pandoc. Use one or the other."
+        )
+    if args.adaptive and args.concurrency <= 1:
+        raise SystemExit(
+            "ERROR: --adaptive needs --concurrency above 1; it adjusts between --min-concurrency "
+            "and --concurrency."
+        )
+    if args.pandoc_workers > 0:
+        start_pandoc_pool(args.pandoc_workers)
+        if args.verbose:
+            print(f"Started {args.pandoc_workers} persistent pandoc workers")
+
+    if not args.no_cache:
+        open_conversion_cache(args.cache_dir or default_cache_dir(), args.cache_max_mb)
+
+    use_html_parser(args.html_parser)
+    start_rate_limiter(args.rate, args.burst)
+    configure_retries(args.retries, args.retry_backoff)
+    # Extraction feeds another machine's import, so this machine's history doesn't apply
+    manifest = None
+    if not args.extract_jsonl:
+        manifest = SourceManifest(
+            Path(os.path.expanduser(args.cache_dir or default_cache_dir())) / "manifest.sqlite3",
+            database_id,
+            skip_unchanged=not args.full_rescan,
+            read_only=args.dry_run,
+        )
+        atexit.register(manifest.close)
+
+    convert_opts = ConvertOptions(
+        args.converter, args.pandoc_batch, args.jobs, args.triage, args.html_parser
+    )
+
     # Read Stickies notes
-    if args.mode == "db":
+    if args.from_jsonl:
+        try:
+            notes = read_jsonl(args.from_jsonl, convert_opts)
+        except OSError as e:
+            raise SystemExit(f"ERROR: Could not read {args.from_jsonl}: {e}")
+
+    elif args.archive:
+        archive = Path(os.path.expanduser(args.archive))
+        try:
+            notes = read_archive(archive, args.tz, convert_opts)
+        except (OSError, ValueError) as e:
+            raise SystemExit(f"ERROR: Could not read archive {archive}: {e}")
+
+    elif args.mode == "db":
         db_path = Path(os.path.expanduser(args.db_path))
         if not db_path.exists():
             # If DB file doesn't exist, try container folder (auto-fallback to rtf_dir mode)
             rtf_folder = Path(os.path.expanduser(args.rtf_dir))
-            rtf_candidates = list(rtf_folder.glob("*.rtf")) + list(rtf_folder.glob("*.rtfd"))
+            rtf_candidates = scan_rtf_dir(rtf_folder)
             if rtf_candidates:
                 if args.verbose:
                     print(
                         f"No DB file at {db_path}, but found {len(rtf_candidates)} RTF files in {rtf_folder}. Falling back to rtf_dir mode."
                     )
-                notes = read_rtf_dir(rtf_folder, args.tz)
+                notes = read_rtf_dir(
+                    rtf_folder,
+                    args.tz,
+                    convert_opts,
+                    rtf_candidates,
+                    manifest,
+                    args.io_threads,
+                    args.read_ahead,
+                )
             else:
                 # Friendly guidance if nothing is found at the chosen path
                 candidates = [
@@ -765,7 +3425,7 @@ def main():
         else:
             # DB file exists, try to read it
             try:
-                notes = read_stickies_db(db_path, args.tz)
+                notes = read_stickies_db(db_path, args.tz, convert_opts)
             except PermissionError as e:
                 raise SystemExit(
                     f"ERROR: Could not open Stickies database at {db_path} — it may be locked.\n"
@@ -776,40 +3436,107 @@ def main():
         rtf_dir = Path(os.path.expanduser(args.rtf_dir))
         if not rtf_dir.exists():
             raise SystemExit(f"ERROR: RTF directory not found at: {rtf_dir}")
-        notes = read_rtf_dir(rtf_dir, args.tz)
+        notes = read_rtf_dir(
+            rtf_dir,
+            args.tz,
+            convert_opts,
+            manifest=manifest,
+            io_threads=args.io_threads,
+            read_ahead=args.read_ahead,
+        )
 
     else:
         notes = []
 
     if args.limit:
-        notes = notes[: args.limit]
-
-    if not notes:
-        print("No notes found.")
+        notes = itertools.islice(notes, args.limit)
+    notes = iter(notes)
+
+    if args.extract_jsonl:
+        dest = jsonl_out if args.extract_jsonl == "-" else args.extract_jsonl
+        count = write_jsonl(notes, dest, args.extract_blocks, args.window)
+        print_conversion_stats(args.verbose)
+        print(f"Extracted {count} notes to {'stdout' if dest is jsonl_out else dest}")
         return
 
-    # Build stable hashes (content + created)
-    items = []
-    for n in notes:
-        h = sha256_hex(normalize_ws(n.plain) + "|" + n.created.isoformat())
-        items.append((n, h))
-
     if args.dry_run:
-        print(f"[DRY RUN] Would import {len(items)} notes. Showing first 5:")
-        for n, h in items[:5]:
+        # Only the previewed notes are converted; the rest are just counted
+        preview = list(itertools.islice(notes, 5))
+        if not preview:
+            print("No notes found.")
+            return
+        convert_lazy_notes(preview)
+        total = len(preview) + sum(1 for _ in notes)
+        print_conversion_stats(args.verbose)
+        print(f"[DRY RUN] Would import {total} notes. Showing first 5:")
+        for n in preview:
+            h = note_hash(n)
             color_info = f" | color {n.color}" if n.color else ""
             print(
                 f"— {n.title} | created {n.created} | modified {n.modified}{color_info} | hash {h[:10]}…"
             )
         return
 
+    first = list(itertools.islice(notes, args.window))
+    if not first:
+        if manifest.skipped:
+            print(f"No changed notes ({manifest.skipped} unchanged since the last import).")
+        else:
+            print("No notes found.")
+        return
+
     existing = fetch_existing_hashes(notion, database_id)
     if args.verbose:
-        print(f"Found {len(existing)} existing Import Hashes; upserting {len(items)} notes.")
+        print(
+            f"Found {len(existing)} existing Import Hashes; upserting notes "
+            f"in windows of {args.window}."
+        )
 
-    for n, h in items:
-        page_id = existing.get(h)
-        create_or_update_page(notion, database_id, n, page_id, h, verbose=args.verbose)
+    uploader = AsyncUploader(token, args.concurrency) if args.concurrency > 1 else None
+    if uploader and args.adaptive:
+        start_concurrency_controller(args.min_concurrency, args.concurrency, args.verbose)
+    if uploader and args.verbose:
+        mode = f"adaptive, starting at {args.min_concurrency}" if args.adaptive else "fixed"
+        print(f"Uploading with up to {args.concurrency} pages in flight ({mode})")
+
+    # Convert and upload one window at a time so memory stays bounded by the window size
+    total = failed = 0
+    try:
+        for window in windows(itertools.chain(first, notes), args.window):
+            first = None  # let the first window be freed once it has been uploaded
+            convert_lazy_notes(window)
+            jobs = []
+            for n in window:
+                h = note_hash(n)
+                jobs.append((n, existing.get(h), h))
+            if uploader:
+                results = uploader.upload(database_id, jobs, verbose=args.verbose)
+            else:
+                results = [
+                    create_or_update_page(notion, database_id, n, page_id, h, verbose=args.verbose)
+                    for n, page_id, h in jobs
+                ]
+            failed += results.count(False)
+            for (n, _, h), ok in zip(jobs, results):
+                state = getattr(n, "source_state", None)
+                # A note whose conversion failed this time stays unrecorded so it is retried
+                if ok and state and conversion_is_final(n.converted):
+                    manifest.record(n.source_id, state[0], state[1], h)
+            manifest.commit()
+            total += len(window)
+    finally:
+        if uploader:
+            uploader.close()
+
+    print_conversion_stats(args.verbose)
+    if failed:
+        print(f"WARNING: {failed} of {total} notes failed to upload (see errors above).")
+    if args.verbose:
+        print(f"Upserted {total - failed} notes.")
+        print(
+            f"Source manifest: {manifest.skipped} unchanged skipped, "
+            f"{manifest.recorded} recorded ({manifest.path})"
+        )
 
 
 if __name__ == "__main__":
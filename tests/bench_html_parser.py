@@ -0,0 +1,50 @@
+"""Time HTML parsing plus block building per BeautifulSoup backend.
+
+    python tests/bench_html_parser.py [--repeat N]
+
+Runs the same corpus the equivalence tests use, so the backends are timed on output they
+are known to agree on.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from stickies_to_notion import HAS_LXML, html_to_text_and_blocks, use_html_parser  # noqa: E402
+from test_html_parser import PANDOC_HTML, generated_corpus  # noqa: E402
+
+
+def bench(backend: str, corpus: list[str], repeat: int) -> float:
+    use_html_parser(backend)
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for html in corpus:
+            html_to_text_and_blocks(html)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per backend; best is kept.")
+    args = parser.parse_args()
+
+    corpus = list(PANDOC_HTML.values()) + generated_corpus()
+    size = sum(len(h) for h in corpus)
+    print(f"{len(corpus)} documents, {size / 1e6:.1f} MB of HTML, best of {args.repeat}")
+    backends = ["html.parser"] + (["lxml"] if HAS_LXML else [])
+    baseline = None
+    for backend in backends:
+        seconds = bench(backend, corpus, args.repeat)
+        baseline = baseline or seconds
+        print(f"  {backend:<12} {seconds:7.3f}s  {baseline / seconds:4.2f}x")
+    if not HAS_LXML:
+        print("  lxml         not installed (pip install lxml)")
+
+
+if __name__ == "__main__":
+    main()
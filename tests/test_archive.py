@@ -0,0 +1,64 @@
+"""Tests for reading notes straight out of zip and tar backups."""
+
+import io
+import plistlib
+import tarfile
+import zipfile
+
+import pytest
+
+from stickies_to_notion import STATE_FILE, TAR_COLOR_LOOKAHEAD, read_archive
+
+YELLOW = {"Red": 1.0, "Green": 1.0, "Blue": 0.6}
+
+
+def members(n: int, state: str):
+    """Note files for n stickies, with the colors file first, last or missing."""
+    colors = plistlib.dumps([{"UUID": f"N{i:05d}", "StickyColor": YELLOW} for i in range(n)])
+    notes = [(f"Stickies/N{i:05d}.rtf", b"{\\rtf1 note %d}" % i) for i in range(n)]
+    state_member = [(f"Stickies/{STATE_FILE}", colors)]
+    return {"first": state_member + notes, "last": notes + state_member, "missing": notes}[state]
+
+
+def write_tar(path, items):
+    with tarfile.open(path, "w:gz") as tf:
+        for name, data in items:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = 1_700_000_000
+            tf.addfile(info, io.BytesIO(data))
+    return path
+
+
+def write_zip(path, items):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in items:
+            zf.writestr(name, data)
+    return path
+
+
+@pytest.mark.parametrize("n", [5, TAR_COLOR_LOOKAHEAD, 3 * TAR_COLOR_LOOKAHEAD])
+@pytest.mark.parametrize("state", ["first", "last"])
+def test_tar_colors_wherever_the_state_file_is_stored(tmp_path, capsys, n, state):
+    path = write_tar(tmp_path / "backup.tar.gz", members(n, state))
+    notes = list(read_archive(path, "UTC"))
+
+    assert [n.source_id.rsplit("/", 1)[1] for n in notes] == [f"N{i:05d}.rtf" for i in range(n)]
+    assert all(note.color == "Yellow" for note in notes)
+    assert "Warning" not in capsys.readouterr().out
+
+
+def test_tar_without_state_file_warns(tmp_path, capsys):
+    n = 2 * TAR_COLOR_LOOKAHEAD
+    path = write_tar(tmp_path / "backup.tar", members(n, "missing"))
+    notes = list(read_archive(path, "UTC"))
+
+    assert len(notes) == n and not any(note.color for note in notes)
+    assert f"{n} notes imported without colors" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("state", ["first", "last"])
+def test_zip_colors(tmp_path, state):
+    path = write_zip(tmp_path / "backup.zip", members(3, state))
+
+    assert [n.color for n in read_archive(path, "UTC")] == ["Yellow"] * 3
@@ -0,0 +1,112 @@
+"""Batched pandoc runs must split back into the same results as one run per note.
+
+BATCH_HTML is pandoc 3.9's output for NOTES joined by convert_rtf_batch with TOKEN.
+"""
+
+import uuid
+
+import pytest
+
+import stickies_to_notion as stn
+from stickies_to_notion import BATCH_MARKER, _split_batch_html, convert_rtf_batch
+
+needs_pandoc = pytest.mark.skipif(not stn.HAS_PANDOC, reason="pandoc is not installed")
+
+HEADER = (
+    b"{\\rtf1\\ansi\\ansicpg1252\\cocoartf2761\n{\\fonttbl\\f0\\fswiss\\fcharset0 Helvetica;}\n"
+)
+NOTES = [
+    HEADER + b"\\f0\\fs24 \\cf0 first\\par second}",
+    HEADER + b"\\f0\\fs24 \\cf0 ends in \\b bold}",  # no trailing \par, bold still on
+    HEADER + b"\\f0\\fs24 \\cf0 \\i italic\\i0\\par}",
+]
+TOKEN = "0" * 32
+MARK = BATCH_MARKER + TOKEN
+BATCH_HTML = (
+    f"<p>first</p>\n<p>second</p>\n<p>{MARK}N0</p>\n<p>ends in <strong>bold</strong></p>\n"
+    f"<p>{MARK}N1</p>\n<p><em>italic</em></p>\n"
+)
+SINGLE_HTML = [
+    "<p>first</p>\n<p>second</p>\n",
+    "<p>ends in <strong>bold</strong></p>\n",
+    "<p><em>italic</em></p>\n",
+]
+PIECES = [html.strip() for html in SINGLE_HTML]
+
+
+def test_split_captured_html():
+    assert _split_batch_html(BATCH_HTML, TOKEN, 3) == PIECES
+
+
+@pytest.mark.parametrize(
+    "wrapped",
+    [
+        "<p><strong>{}</strong></p>",
+        "<p><strong><em>{}</em></strong></p>",
+        '<p><span class="x"> {} </span></p>',
+    ],
+)
+def test_split_markers_wrapped_in_inline_tags(wrapped):
+    html = BATCH_HTML.replace(f"<p>{MARK}N1</p>", wrapped.format(f"{MARK}N1"))
+    assert _split_batch_html(html, TOKEN, 3) == PIECES
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        # The marker ran into the previous note's last paragraph
+        BATCH_HTML.replace(f"</strong></p>\n<p>{MARK}N1", f" {MARK}N1</strong>"),
+        BATCH_HTML.replace(f"<p>{MARK}N1</p>\n", ""),
+        BATCH_HTML.replace(f"{MARK}N1", f"{MARK}N0"),
+        BATCH_HTML + f"<p>{MARK}N2</p>\n",
+    ],
+    ids=["merged", "missing", "out of order", "extra"],
+)
+def test_split_lost_boundary(html):
+    assert _split_batch_html(html, TOKEN, 3) is None
+
+
+@pytest.fixture
+def pandoc(monkeypatch):
+    """Fake pandoc: the captured batch output, or each note's own output when run alone."""
+    runs = {"inputs": [], "batch": BATCH_HTML}
+
+    def convert(text, to="html", src="rtf"):
+        runs["inputs"].append(text)
+        if MARK in text:
+            return runs["batch"]
+        return SINGLE_HTML[[n.decode() for n in NOTES].index(text)]
+
+    monkeypatch.setattr(stn, "HAS_PANDOC", True)
+    monkeypatch.setattr(stn, "pandoc_convert", convert)
+    monkeypatch.setattr(stn.uuid, "uuid4", lambda: uuid.UUID(TOKEN))
+    monkeypatch.setattr(stn, "batch_stats", {"batches": 0, "notes": 0, "fallbacks": 0})
+    return runs
+
+
+def test_batch_matches_single_runs(pandoc):
+    batched = convert_rtf_batch(NOTES)
+
+    assert len(pandoc["inputs"]) == 1 and stn.batch_stats["fallbacks"] == 0
+    # Each note is a plain group: pandoc rejects a {\rtf1 ...} document nested in another
+    assert pandoc["inputs"][0].count("{\\rtf") == 1
+    assert batched == [stn.rtf_to_html_text_blocks(n) for n in NOTES]
+
+
+def test_batch_falls_back_when_a_boundary_is_lost(pandoc):
+    pandoc["batch"] = BATCH_HTML.replace(f"<p>{MARK}N1</p>\n", "")
+    assert convert_rtf_batch(NOTES) == [stn.rtf_to_html_text_blocks(n) for n in NOTES]
+    assert stn.batch_stats["fallbacks"] == 1
+
+
+@needs_pandoc
+def test_real_pandoc_batch(monkeypatch):
+    monkeypatch.setattr(stn, "batch_stats", {"batches": 0, "notes": 0, "fallbacks": 0})
+    notes = NOTES + [
+        HEADER + b'\\f0 {\\field{\\*\\fldinst{HYPERLINK "https://x.org"}}{\\fldrslt link}} after}',
+        HEADER + b"\\f0 caf\\'e9 \\ul under\\ulnone\\par\n\\par}",
+        HEADER + b"}",
+    ]
+
+    assert convert_rtf_batch(notes) == [stn.rtf_to_html_text_blocks(n) for n in notes]
+    assert stn.batch_stats["fallbacks"] == 0
@@ -0,0 +1,138 @@
+"""Every converter must derive the same Import Hash text and title from a note.
+
+pandoc isn't needed: its output for each note is given here as pandoc 3 produces it, and
+pandoc_convert is patched to return it.
+"""
+
+import json
+
+import pytest
+
+import stickies_to_notion as stn
+
+
+def para(*inlines):
+    return {"t": "Para", "c": list(inlines)}
+
+
+def s(text):
+    return {"t": "Str", "c": text}
+
+
+SP = {"t": "Space"}
+ATTR = ["", [], []]
+
+# RTF body -> (pandoc HTML, pandoc JSON AST blocks)
+CASES = {
+    "bold inside a word": (
+        r"im\b port\b0 ant note",
+        "<p>im<strong>port</strong>ant note</p>",
+        [para(s("im"), {"t": "Strong", "c": [s("port")]}, s("ant"), SP, s("note"))],
+    ),
+    "nested marks": (
+        r"a\b b\i c\b0 d\i0  e",
+        "<p>a<strong>b<em>c</em></strong><em>d</em> e</p>",
+        [
+            para(
+                s("a"),
+                {"t": "Strong", "c": [s("b"), {"t": "Emph", "c": [s("c")]}]},
+                {"t": "Emph", "c": [s("d")]},
+                SP,
+                s("e"),
+            )
+        ],
+    ),
+    "quotes": (
+        r"say \ldblquote hi\rdblquote  and \lquote so\rquote",
+        "<p>say “hi” and ‘so’</p>",
+        [
+            para(
+                s("say"),
+                SP,
+                {"t": "Quoted", "c": [{"t": "DoubleQuote"}, [s("hi")]]},
+                SP,
+                s("and"),
+                SP,
+                {"t": "Quoted", "c": [{"t": "SingleQuote"}, [s("so")]]},
+            )
+        ],
+    ),
+    "link and superscript": (
+        None,
+        '<p>a<a href="https://x">b</a>c x<sup>2</sup></p>',
+        [
+            para(
+                s("a"),
+                {"t": "Link", "c": [ATTR, [s("b")], ["https://x", ""]]},
+                s("c"),
+                SP,
+                s("x"),
+                {"t": "Superscript", "c": [s("2")]},
+            )
+        ],
+    ),
+    "paragraphs": (
+        r"first \i line\i0\par second",
+        "<p>first <em>line</em></p>\n<p>second</p>",
+        [para(s("first"), SP, {"t": "Emph", "c": [s("line")]}), para(s("second"))],
+    ),
+}
+
+
+def hash_text(plain):
+    return stn.normalize_ws(plain)
+
+
+def title(plain):
+    return stn.first_nonempty_line(plain)
+
+
+@pytest.fixture
+def pandoc(monkeypatch):
+    """Make pandoc_convert return the given HTML or JSON AST."""
+    outputs = {}
+    monkeypatch.setattr(stn, "HAS_PANDOC", True)
+    monkeypatch.setattr(stn, "pandoc_convert", lambda text, to="html", src="rtf": outputs[to])
+    return outputs
+
+
+@pytest.mark.parametrize("body, html, ast", CASES.values(), ids=CASES.keys())
+def test_pandoc_json_matches_html_route(pandoc, body, html, ast):
+    pandoc["html"] = html
+    pandoc["json"] = json.dumps({"pandoc-api-version": [1, 23], "meta": {}, "blocks": ast})
+    _, html_plain, _ = stn.rtf_to_html_text_blocks(b"{\\rtf1 x}")
+    ast_plain, _ = stn.rtf_to_blocks_pandoc_json(b"{\\rtf1 x}")
+
+    assert hash_text(ast_plain) == hash_text(html_plain)
+    assert title(ast_plain) == title(html_plain)
+
+
+@pytest.mark.parametrize("body, html, ast", CASES.values(), ids=CASES.keys())
+def test_native_matches_html_route(pandoc, body, html, ast):
+    if body is None:
+        pytest.skip("the native converter hands links to pandoc")
+    pandoc["html"] = html
+    rtf = ("{\\rtf1\\ansi\\ansicpg1252\\cocoartf2761\n\\f0\\fs24 \\cf0 " + body + "}").encode()
+    _, html_plain, _ = stn.rtf_to_html_text_blocks(rtf)
+    native_plain, _ = stn.rtf_to_blocks_native(rtf)
+
+    assert hash_text(native_plain) == hash_text(html_plain)
+    assert title(native_plain) == title(html_plain)
+
+
+def test_quotes_keep_their_marks(pandoc):
+    pandoc["json"] = json.dumps({"blocks": CASES["quotes"][2]})
+    plain, blocks = stn.rtf_to_blocks_pandoc_json(b"{\\rtf1 x}")
+
+    assert hash_text(plain) == "say “hi” and ‘so’"
+    rich = blocks[0]["paragraph"]["rich_text"]
+    assert "".join(r["text"]["content"] for r in rich) == "say “hi” and ‘so’"
+
+
+def test_rich_text_is_not_split_by_element_edges(pandoc):
+    pandoc["json"] = json.dumps({"blocks": CASES["link and superscript"][2]})
+    _, blocks = stn.rtf_to_blocks_pandoc_json(b"{\\rtf1 x}")
+
+    rich = blocks[0]["paragraph"]["rich_text"]
+    assert all(r["text"]["content"] for r in rich)
+    assert "".join(r["text"]["content"] for r in rich) == "abc x2"
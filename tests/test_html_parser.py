@@ -0,0 +1,99 @@
+"""The lxml and html.parser backends must build the same blocks from pandoc's HTML."""
+
+import random
+
+import pytest
+
+from stickies_to_notion import HAS_LXML, html_to_text_and_blocks, use_html_parser
+
+needs_lxml = pytest.mark.skipif(not HAS_LXML, reason="lxml is not installed")
+
+# Shapes pandoc's HTML writer produces for Stickies RTF: every element is closed
+PANDOC_HTML = {
+    "inline": "<p>Hello <strong>bold</strong> and <em>it</em> <u>u</u> <del>s</del></p>\n"
+    "<p>Second &amp; third&nbsp;x &lt;tag&gt;</p>",
+    "headings": '<h1 id="t">Title</h1>\n<p>para</p>\n<h2>Sub</h2>\n<h4>deep</h4>',
+    "lists": "<ul>\n<li>one</li>\n<li><p>two <u>u</u></p></li>\n<li>three\n<ul>\n"
+    '<li>nested</li>\n</ul></li>\n</ul>\n<ol start="3">\n<li>x</li>\n</ol>',
+    "code": "<pre><code>line1\n  line2</code></pre>\n"
+    "<blockquote>\n<p>quoted <code>c</code></p>\n</blockquote>",
+    "unicode": '<p>café \U0001f600 — <span style="color:red">red</span><br />\nbreak</p>',
+    "empty": "<p></p>\n<p> </p>\n<div>\n<p>in div</p>\n</div>\n<hr />",
+    "links": '<p><a href="https://example.com">link <strong>b</strong></a></p>\n'
+    "<table>\n<tr>\n<td>c</td>\n</tr>\n</table>",
+    "long": "<p>" + "word " * 2000 + "</p>",
+}
+
+_WORDS = ["alpha", "<strong>b</strong>", "<em>e</em>", "&lt;x&gt;", "été", "<u>u</u>"]
+_SHAPES = [
+    "<p>{}</p>",
+    "<h2>{}</h2>",
+    "<ul>\n<li>{}</li>\n<li>z</li>\n</ul>",
+    "<blockquote>\n<p>{}</p>\n</blockquote>",
+]
+
+
+def generated_corpus(n: int = 200, seed: int = 0) -> list[str]:
+    """Seeded pandoc-shaped documents mixing paragraphs, headings, lists and quotes."""
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(1, 30)):
+            text = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 12)))
+            parts.append(rng.choice(_SHAPES).format(text))
+        docs.append("\n".join(parts))
+    return docs
+
+
+def convert(html: str, backend: str):
+    use_html_parser(backend)
+    return html_to_text_and_blocks(html)
+
+
+@pytest.fixture(autouse=True)
+def restore_parser():
+    yield
+    use_html_parser("auto")
+
+
+@needs_lxml
+@pytest.mark.parametrize("html", PANDOC_HTML.values(), ids=PANDOC_HTML.keys())
+def test_backends_agree_on_pandoc_html(html):
+    assert convert(html, "lxml") == convert(html, "html.parser")
+
+
+@needs_lxml
+def test_backends_agree_on_generated_corpus():
+    diffs = [h for h in generated_corpus() if convert(h, "lxml") != convert(h, "html.parser")]
+
+    assert diffs == []
+
+
+def _texts(blocks):
+    return [
+        "".join(r["text"]["content"] for r in b[b["type"]]["rich_text"])
+        for b in blocks
+        if "rich_text" in b.get(b["type"], {})
+    ]
+
+
+# Pandoc never leaves an element open, and every input reaches the parser through pandoc
+# (JSONL records carry blocks, not HTML), so these only pin the backends' behaviour: lxml
+# applies the HTML5 implied end tags and html.parser nests the elements.
+UNCLOSED = {
+    "p": ("<p>a<p>b</p>", ["a", "b"], ["ab"]),
+    "li": ("<ul><li>a<li>b</ul>", ["a", "b"], ["ab"]),
+    "inline": ("<b>open <p>c</p>", ["open ", "c"], ["open c"]),
+}
+
+
+@pytest.mark.parametrize("html, lxml_texts, stdlib_texts", UNCLOSED.values(), ids=UNCLOSED.keys())
+def test_unclosed_elements(html, lxml_texts, stdlib_texts):
+    assert _texts(convert(html, "html.parser")[1]) == stdlib_texts
+    if HAS_LXML:
+        assert _texts(convert(html, "lxml")[1]) == lxml_texts
+
+
+def test_auto_prefers_lxml():
+    assert use_html_parser("auto") == ("lxml" if HAS_LXML else "html.parser")
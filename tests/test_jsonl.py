@@ -0,0 +1,29 @@
+"""Notes extracted to JSON Lines, on a machine without Notion credentials."""
+
+import json
+import sys
+
+import stickies_to_notion as stn
+
+
+def test_extract_to_stdout(tmp_path, monkeypatch, capsys):
+    folder = tmp_path / "notes"
+    folder.mkdir()
+    for name in ("A", "B"):
+        (folder / f"{name}.rtf").write_bytes(b"{\\rtf1 note %s}" % name.encode())
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(stn, "token", None)
+    monkeypatch.setattr(stn, "database_id", None)
+    # main sends its messages to stderr by swapping sys.stdout; undo that afterwards
+    monkeypatch.setattr(sys, "stdout", sys.stdout)
+    argv = ["--rtf-dir", str(folder), "--no-cache", "--extract-jsonl", "-", "--verbose"]
+    monkeypatch.setattr(sys, "argv", ["stickies_to_notion.py", *argv])
+
+    stn.main()
+
+    out, err = capsys.readouterr()
+    records = [json.loads(line) for line in out.splitlines()]
+    assert sorted(r["fallback_title"] for r in records) == ["A", "B"]
+    assert "Extracted 2 notes to stdout" in err
+    assert "Using database ID" not in err
+    assert not (tmp_path / "-").exists()
@@ -0,0 +1,134 @@
+"""Tests for the binary plist reader and the NSKeyedArchiver decoder."""
+
+import datetime as dt
+import plistlib
+from plistlib import UID
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from stickies_to_notion import BinaryPlist, KeyedArchive, read_stickies_db
+
+EPOCH = dt.datetime(2001, 1, 1, tzinfo=dt.timezone.utc)
+NOTE_CLASS = {"$classname": "StickiesDocument", "$classes": ["StickiesDocument", "NSObject"]}
+
+
+def keyed_archive(notes, note_class=NOTE_CLASS) -> dict:
+    """An NSKeyedArchiver plist of note objects, each given as (rtf, uuid, created, modified)."""
+    objects = ["$null"]
+
+    def add(obj):
+        objects.append(obj)
+        return UID(len(objects) - 1)
+
+    note_cls = add(note_class)
+    date_cls = add({"$classname": "NSDate", "$classes": ["NSDate", "NSObject"]})
+    data_cls = add({"$classname": "NSMutableData", "$classes": ["NSMutableData", "NSObject"]})
+    array_cls = add({"$classname": "NSArray", "$classes": ["NSArray", "NSObject"]})
+    refs = []
+    for i, (rtf, uuid, created, modified) in enumerate(notes):
+        # Alternate between bare data and an NSMutableData wrapper
+        data = add(rtf) if i % 2 else add({"NS.data": rtf, "$class": data_cls})
+        fields = {
+            "RTFDData": data,
+            "CreationDate": add({"NS.time": created, "$class": date_cls}),
+            "ModificationDate": add({"NS.time": modified, "$class": date_cls}),
+            "$class": note_cls,
+        }
+        if uuid is not None:
+            fields["UUID"] = add(uuid)
+        refs.append(add(fields))
+    root = add({"NS.objects": refs, "$class": array_cls})
+    return {
+        "$archiver": "NSKeyedArchiver",
+        "$version": 100000,
+        "$top": {"root": root},
+        "$objects": objects,
+    }
+
+
+@pytest.fixture
+def write_db(tmp_path):
+    def write(obj):
+        path = tmp_path / "StickiesDatabase"
+        path.write_bytes(plistlib.dumps(obj, fmt=plistlib.FMT_BINARY))
+        return path
+
+    return write
+
+
+NOTES = [
+    (b"{\\rtf1 first}", "UUID-A", 0.0, 86400.0),
+    (b"{\\rtf1 second}", "UUID-B", 6e8, 6e8 + 0.5),
+    (b"{\\rtf1 third}", None, 7e8, 7e8),
+]
+
+
+def test_binary_plist_values(write_db):
+    value = {
+        "int": -3,
+        "big": 1 << 40,
+        "real": 2.5,
+        "ascii": "abc",
+        "unicode": "café \U0001f600",
+        "data": b"\x00\x01",
+        "nested": [True, {"k": [1, 2]}],
+    }
+    plist = BinaryPlist(write_db(value))
+
+    assert plist.value(plist.top, depth=4) == value
+    assert plist.value(plist.top, depth=1)["nested"] is None
+
+
+def test_dates_are_utc_and_converted_to_tz(write_db):
+    notes = list(read_stickies_db(write_db(keyed_archive(NOTES)), "America/New_York"))
+
+    assert notes[0].created == EPOCH
+    assert notes[0].created.tzinfo == ZoneInfo("America/New_York")
+    assert notes[0].created.hour == 19  # 2000-12-31 19:00 in New York
+    assert notes[0].modified == EPOCH + dt.timedelta(days=1)
+    assert notes[1].modified == EPOCH + dt.timedelta(seconds=6e8 + 0.5)
+
+
+def test_ids_and_rtf(write_db):
+    notes = list(read_stickies_db(write_db(keyed_archive(NOTES)), "UTC"))
+
+    assert [bytes(n.raw) for n in notes] == [rtf for rtf, *_ in NOTES]
+    # Notes without an archived identifier fall back to their object index
+    assert [n.source_id for n in notes[:2]] == ["db:UUID-A", "db:UUID-B"]
+    assert notes[2].source_id.startswith("db#")
+
+
+def test_ids_survive_reordering(write_db):
+    forward = read_stickies_db(write_db(keyed_archive(NOTES[:2])), "UTC")
+    ids = {n.source_id: n.created for n in forward}
+    backward = read_stickies_db(write_db(keyed_archive(NOTES[:2][::-1])), "UTC")
+
+    assert {n.source_id: n.created for n in backward} == ids
+
+
+@pytest.mark.parametrize(
+    "note_class",
+    [
+        {"$classname": "Document", "$classes": ["Document", "NSObject"]},
+        {"$classname": "MyDocument", "$classes": ["MyDocument", "Document", "NSObject"]},
+    ],
+    ids=["Document", "subclass"],
+)
+def test_note_classes(write_db, note_class):
+    assert len(list(read_stickies_db(write_db(keyed_archive(NOTES, note_class)), "UTC"))) == 3
+
+
+def test_other_classes_are_skipped_with_a_warning(write_db, capsys):
+    other = {"$classname": "Attachment", "$classes": ["Attachment", "NSObject"]}
+    path = write_db(keyed_archive(NOTES, other))
+
+    assert list(read_stickies_db(path, "UTC")) == []
+    assert "skipped RTF in Attachment" in capsys.readouterr().out
+
+
+def test_open_rejects_plain_plists(write_db):
+    path = write_db({"notes": [{"NSRTFData": b"{\\rtf1 x}"}]})
+
+    assert KeyedArchive.open(BinaryPlist(path)) is None
+    assert [bytes(n.raw) for n in read_stickies_db(path, "UTC")] == [b"{\\rtf1 x}"]
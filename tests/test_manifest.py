@@ -0,0 +1,114 @@
+"""The source manifest only records notes that were converted and uploaded for good."""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+import stickies_to_notion as stn
+
+
+class FakeNotion:
+    """Accepts every Notion call and remembers which endpoints were used."""
+
+    def __init__(self, calls, name="notion"):
+        self._calls, self._name = calls, name
+
+    def __getattr__(self, attr):
+        return FakeNotion(self._calls, f"{self._name}.{attr}")
+
+    def __call__(self, **kwargs):
+        self._calls.append(self._name)
+        if self._name.endswith("databases.query"):
+            return {"results": [], "has_more": False}
+        if self._name.endswith("pages.create"):
+            return {"id": "page"}
+        return {}
+
+
+@pytest.fixture
+def run_main(tmp_path, monkeypatch):
+    calls, closers = [], []
+    monkeypatch.setattr(stn, "Client", lambda auth: FakeNotion(calls))
+    # Run main's exit handlers (which commit the manifest) after each call instead
+    monkeypatch.setattr(stn.atexit, "register", closers.append)
+    monkeypatch.setattr(stn, "token", "secret")
+    monkeypatch.setattr(stn, "database_id", "db")
+
+    def run(*argv):
+        calls.clear()
+        args = ["--rtf-dir", str(tmp_path / "notes"), "--cache-dir", str(tmp_path / "cache")]
+        monkeypatch.setattr(sys, "argv", ["stickies_to_notion.py", *args, "--no-cache", *argv])
+        try:
+            stn.main()
+        finally:
+            while closers:
+                closers.pop()()
+        return calls.count("notion.pages.create")
+
+    return run
+
+
+@pytest.fixture
+def notes_dir(tmp_path):
+    folder = tmp_path / "notes"
+    folder.mkdir()
+    for name in ("A", "B", "C"):
+        (folder / f"{name}.rtf").write_bytes(b"{\\rtf1 note %s}" % name.encode())
+    return folder
+
+
+def recorded(tmp_path) -> dict:
+    db = sqlite3.connect(str(tmp_path / "cache" / "manifest.sqlite3"))
+    rows = db.execute("SELECT path, mtime_ns FROM sources").fetchall()
+    db.close()
+    return {os.path.basename(path): mtime for path, mtime in rows}
+
+
+def test_unchanged_notes_are_skipped(tmp_path, notes_dir, run_main):
+    assert run_main() == 3
+    assert sorted(recorded(tmp_path)) == ["A.rtf", "B.rtf", "C.rtf"]
+    assert run_main() == 0
+
+
+def test_failed_conversions_are_not_recorded(tmp_path, notes_dir, run_main, monkeypatch):
+    def convert(text, to="html", src="rtf"):
+        if "note B" in text:
+            raise RuntimeError("pandoc timed out")
+        return f"<p>{text}</p>"
+
+    # pandoc is "installed" but fails on B, which then goes up as text only
+    monkeypatch.setattr(stn, "HAS_PANDOC", True)
+    monkeypatch.setattr(stn, "pandoc_convert", convert)
+    assert run_main() == 3
+    assert sorted(recorded(tmp_path)) == ["A.rtf", "C.rtf"]
+
+    # B is converted again on the next run, and recorded once pandoc succeeds
+    monkeypatch.setattr(stn, "pandoc_convert", lambda text, to="html", src="rtf": "<p>B</p>")
+    assert run_main() == 1
+    assert sorted(recorded(tmp_path)) == ["A.rtf", "B.rtf", "C.rtf"]
+
+
+def test_dry_run_writes_nothing(tmp_path, notes_dir, run_main, capsys):
+    run_main()
+    before = recorded(tmp_path)
+    # Same content under a new mtime: a real run would record the new mtime
+    for path in notes_dir.iterdir():
+        os.utime(path, ns=(1, 1))
+
+    run_main("--dry-run")
+
+    assert recorded(tmp_path) == before
+    assert "No notes found" in capsys.readouterr().out
+    run_main()
+    assert set(recorded(tmp_path).values()) == {1}
+
+
+def test_read_only_manifest(tmp_path):
+    path = tmp_path / "manifest.sqlite3"
+    manifest = stn.SourceManifest(path, "db", read_only=True)
+    manifest.record("/x.rtf", (1, 2, 3), "content", "import")
+    manifest.close()
+
+    assert stn.SourceManifest(path, "db").known == {}
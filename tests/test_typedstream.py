@@ -0,0 +1,254 @@
+"""Tests for the NSArchiver typedstream reader, using archives built in the test."""
+
+import datetime as dt
+import struct
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from stickies_to_notion import (
+    STICKIES_COLORS,
+    ArchivedObject,
+    TypedStream,
+    TypedStreamError,
+    read_stickies_db,
+    rtfd_text,
+)
+
+NEW, NIL, END, INT2, INT4, FLOAT = 0x84, 0x85, 0x86, 0x81, 0x82, 0x83
+FIRST_REF = -110
+SIGNATURES = {"<": b"streamtyped", ">": b"typedstream"}  # little- and big-endian archives
+
+
+class Writer:
+    """Minimal typedstream encoder: shared strings and objects are written once, then referenced."""
+
+    def __init__(self, order: str = "<"):
+        self.order = order
+        self.buf = bytearray(b"\x04")
+        self.strings: dict[bytes, int] = {}
+        self.objects: dict[object, int] = {}  # classes and objects share one reference table
+        self.count = 0
+        self.unshared(SIGNATURES[order])
+        self.int(1000)  # system version
+
+    def int(self, v: int):
+        if FIRST_REF < v <= 127:
+            self.buf += struct.pack("b", v)
+        elif -(1 << 15) <= v < 1 << 15:
+            self.buf += bytes([INT2]) + struct.pack(self.order + "h", v)
+        else:
+            self.buf += bytes([INT4]) + struct.pack(self.order + "i", v)
+
+    def ref(self, n: int):
+        self.int(n + FIRST_REF)
+
+    def unshared(self, data: bytes):
+        self.int(len(data))
+        self.buf += data
+
+    def shared(self, data: bytes):
+        if data in self.strings:
+            self.ref(self.strings[data])
+        else:
+            self.buf.append(NEW)
+            self.unshared(data)
+            self.strings[data] = len(self.strings)
+
+    def cls(self, chain):
+        if not chain:
+            self.buf.append(NIL)
+        elif chain[0] in self.objects:
+            self.ref(self.objects[chain[0]])
+        else:
+            self.buf.append(NEW)
+            self.shared(chain[0].encode())
+            self.int(0)  # class version
+            self.objects[chain[0]] = self.count
+            self.count += 1
+            self.cls(chain[1:])
+
+    def begin(self, chain, key=None):
+        """Start an object; key lets a later reference() point back at it."""
+        self.buf.append(NEW)
+        if key is not None:
+            self.objects[key] = self.count
+        self.count += 1
+        self.cls(chain)
+
+    def reference(self, key):
+        self.ref(self.objects[key])
+
+    def end(self):
+        self.buf.append(END)
+
+    def double(self, v: float):
+        self.buf.append(FLOAT)
+        self.buf += struct.pack(self.order + "d", v)
+
+    def date(self, seconds: float, key=None):
+        self.shared(b"@")
+        self.begin(["NSDate", "NSObject"], key)
+        self.shared(b"d")
+        self.double(seconds)
+        self.end()
+
+
+def flat_rtfd(rtf: bytes) -> bytes:
+    """Flattened RTFD: a directory of file names and contents with TXT.rtf among them."""
+    names, datas = [b".", b"TXT.rtf"], [b"\x00" * 4, rtf]
+    out = b"rtfd\x00\x00\x00\x00" + struct.pack("<I", len(names))
+    for n in names:
+        out += struct.pack("<I", len(n)) + n
+    out += struct.pack("<I", len(datas))
+    for d in datas:
+        out += struct.pack("<I", len(d)) + d
+    return out + b"\x00{trailing attachment data}"
+
+
+def stickies_db(notes, order="<", share_dates=False) -> bytes:
+    """A StickiesDatabase: an NSMutableArray of Documents, each as (rtf, color, created, modified).
+
+    With share_dates, every Document's modification date is a reference to its creation date.
+    """
+    w = Writer(order)
+    w.shared(b"@")
+    w.begin(["NSMutableArray", "NSArray", "NSObject"])
+    w.shared(b"i")
+    w.int(len(notes))
+    for i, (rtf, color, created, modified) in enumerate(notes):
+        w.shared(b"@")
+        w.begin(["Document", "NSObject"])
+        w.shared(b"@")
+        w.begin(["NSMutableData", "NSData", "NSObject"])
+        data = flat_rtfd(rtf)
+        w.shared(b"i")
+        w.int(len(data))
+        w.shared(f"[{len(data)}c]".encode())
+        w.buf += data
+        w.end()
+        w.shared(b"i")
+        w.int(1)  # window flags
+        w.shared(b"{_NSRect={_NSPoint=ff}{_NSSize=ff}}")
+        for v in (10, 20, 300, 200):
+            w.int(v)
+        w.shared(b"i")
+        w.int(color)
+        w.date(created, key=("date", i))
+        if share_dates:
+            w.shared(b"@")
+            w.reference(("date", i))
+        else:
+            w.date(modified)
+        w.end()
+    w.end()
+    return bytes(w.buf)
+
+
+@pytest.fixture
+def write_db(tmp_path):
+    def write(data: bytes):
+        path = tmp_path / "StickiesDatabase"
+        path.write_bytes(data)
+        return path
+
+    return write
+
+
+NOTES = [
+    (b"{\\rtf1\\ansi first note}", 0, 0.0, 86400.0),
+    (b"{\\rtf1\\ansi {\\b second} note \\{not a group\\}}", 4, 6e8, 6e8 + 3600.5),
+    # Long enough that lengths need the two-byte integer form
+    (b"{\\rtf1\\ansi " + b"x" * 500 + b"}", 5, 7e8, 7e8),
+]
+
+
+@pytest.mark.parametrize("order", ["<", ">"], ids=["streamtyped", "typedstream"])
+def test_reads_notes_in_both_byte_orders(write_db, order):
+    notes = list(read_stickies_db(write_db(stickies_db(NOTES, order)), "UTC"))
+
+    assert [bytes(n.raw) for n in notes] == [rtf for rtf, *_ in NOTES]
+    assert [n.color for n in notes] == ["Yellow", "Purple", "Gray"]
+    assert [n.source_id for n in notes] == ["db#0", "db#1", "db#2"]
+
+
+@pytest.mark.parametrize("order", ["<", ">"], ids=["streamtyped", "typedstream"])
+def test_system_version_and_large_ints(write_db, order):
+    w = Writer(order)
+    w.shared(b"@")
+    w.begin(["Holder", "NSObject"])
+    w.shared(b"iii")
+    for v in (-5, 40000, -70000):
+        w.int(v)
+    w.end()
+    stream = TypedStream(write_db(bytes(w.buf)))
+
+    assert stream.system_version == 1000
+    assert stream._shared() == b"@"
+    obj = stream._object()
+    assert obj.classname == "Holder"
+    assert [v for _, v in obj.values] == [-5, 40000, -70000]
+
+
+def test_dates_are_utc_and_converted_to_tz(write_db):
+    notes = list(read_stickies_db(write_db(stickies_db(NOTES)), "America/New_York"))
+
+    epoch = dt.datetime(2001, 1, 1, tzinfo=dt.timezone.utc)
+    assert notes[0].created == epoch
+    assert notes[0].created.tzinfo == ZoneInfo("America/New_York")
+    assert notes[0].modified == epoch + dt.timedelta(days=1)
+    assert notes[1].modified == epoch + dt.timedelta(seconds=6e8 + 3600.5)
+
+
+def test_object_references_resolve_to_the_same_value(write_db):
+    notes = list(read_stickies_db(write_db(stickies_db(NOTES, share_dates=True)), "UTC"))
+
+    assert [n.modified for n in notes] == [n.created for n in notes]
+    assert [n.color for n in notes] == ["Yellow", "Purple", "Gray"]
+
+
+def test_shared_strings_and_classes_are_decoded_once(write_db):
+    stream = TypedStream(write_db(stickies_db(NOTES)))
+    docs = list(stream.iter_root_array())
+
+    assert all(isinstance(d, ArchivedObject) and d.classname == "Document" for d in docs)
+    # Every type encoding and class name after the first note came from a reference
+    assert len(stream._strings) == len(set(stream._strings))
+    assert b"@" in stream._strings and b"Document" in stream._strings
+    assert stream._objects.count("Document") == 1
+    assert stream._objects.count("NSDate") == 1
+
+
+@pytest.mark.parametrize("index, color", list(enumerate(STICKIES_COLORS)) + [(6, None), (-1, None)])
+def test_color_index(write_db, index, color):
+    (note,) = read_stickies_db(write_db(stickies_db([(b"{\\rtf1 x}", index, 0.0, 0.0)])), "UTC")
+
+    assert note.color == color
+
+
+def test_rtfd_text():
+    rtf = b"{\\rtf1 a {\\i b} \\} c}"
+
+    assert bytes(rtfd_text(flat_rtfd(rtf))) == rtf
+    assert bytes(rtfd_text(memoryview(flat_rtfd(rtf)))) == rtf
+    assert rtfd_text(rtf) == rtf
+    assert rtfd_text(b"{\\rtf1 never closed") == b"{\\rtf1 never closed"
+    assert rtfd_text(b"rtfd\x00{no rtf here}") is None
+
+
+def test_documents_without_text_are_skipped(write_db):
+    data = stickies_db(NOTES[:1]).replace(b"{\\rtf1\\ansi first note}", b"{plain text, no rtf!!!}")
+
+    assert list(read_stickies_db(write_db(data), "UTC")) == []
+
+
+def test_rejects_other_files(write_db):
+    with pytest.raises(TypedStreamError):
+        TypedStream(write_db(b"\x04\x0bnottypedstr\x81\xe8\x03"))
+
+    w = Writer()
+    w.shared(b"@")
+    w.begin(["Document", "NSObject"])
+    w.end()
+    with pytest.raises(TypedStreamError, match="not an array"):
+        list(TypedStream(write_db(bytes(w.buf))).iter_root_array())